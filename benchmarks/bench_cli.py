@@ -0,0 +1,40 @@
+"""Cold-start time and batch throughput of the headless CLI.
+
+    python benchmarks/bench_cli.py [lines]
+"""
+from __future__ import annotations
+import io, subprocess, sys, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dndroller.cli import roll_stream
+
+EXPRS = ["d20+5", "4d6kh3", "2d8! + 1d4 - 2", "8d6", "2d20kl1 + 3", "d%"]
+
+
+def startup(cmd, repeat: int = 10) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv):
+    lines = int(argv[0]) if argv else 20_000
+    bare = startup([sys.executable, "-c", "pass"])
+    cli = startup([sys.executable, "-m", "dndroller", "d20"])
+    print(f"interpreter startup   {bare * 1e3:7.1f} ms")
+    print(f"CLI cold start        {cli * 1e3:7.1f} ms  (+{(cli - bare) * 1e3:.1f} ms)")
+    exprs = [EXPRS[i % len(EXPRS)] for i in range(lines)]
+    t0 = time.perf_counter()
+    roll_stream(exprs, io.StringIO())
+    dt = time.perf_counter() - t0
+    print(f"batch throughput      {lines / dt:9.0f} expr/s over {lines} lines")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
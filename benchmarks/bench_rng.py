@@ -0,0 +1,37 @@
+"""Dice throughput of each RNG backend, d4 through d100.
+
+    python benchmarks/bench_rng.py [qty] [--python]
+
+``--python`` forces the pure-Python engine path even when NumPy is installed.
+"""
+from __future__ import annotations
+import sys, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dndroller.engine import DICE_SIDES, RollEngine
+from dndroller.rng import BACKENDS
+
+
+def main(argv):
+    use_numpy = "--python" not in argv
+    sizes = [int(a) for a in argv if a.isdigit()] or [1, 50, 1_000_000]
+    print(f"{'backend':>8} {'die':>5} " + "".join(f"{f'{q} dice/s':>18}" for q in sizes))
+    for name, cls in BACKENDS.items():
+        for die, sides in DICE_SIDES.items():
+            row = f"{name:>8} {die:>5} "
+            for qty in sizes:
+                backend = cls(None if name == "system" else 1)
+                eng = RollEngine(backend.randbytes, use_numpy=use_numpy)
+                reps = max(1, 200_000 // qty)
+                t0 = time.perf_counter()
+                for _ in range(reps):
+                    eng.roll(qty, sides)
+                dt = time.perf_counter() - t0
+                row += f"{qty * reps / dt:>18,.0f}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
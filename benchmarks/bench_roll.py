@@ -0,0 +1,48 @@
+"""Compare the bulk roll engine with the old per-die SystemRandom path.
+
+    python benchmarks/bench_roll.py [qty ...]
+"""
+from __future__ import annotations
+import sys, time
+from pathlib import Path
+from random import SystemRandom
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dndroller.engine import DICE_SIDES, RollEngine
+
+sysrand = SystemRandom()
+
+
+def per_die(qty: int, sides: int):
+    return [sysrand.randint(1, sides) for _ in range(qty)]
+
+
+def best_of(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv):
+    sizes = [int(a) for a in argv] or [50, 10_000, 1_000_000]
+    engines = {"bulk-python": RollEngine(use_numpy=False)}
+    if RollEngine().use_numpy:
+        engines["bulk-numpy"] = RollEngine(use_numpy=True)
+    print(f"{'die':>5} {'qty':>9} {'sysrand ms':>11}" +
+          "".join(f" {name + ' ms':>15}" for name in engines))
+    for name, sides in DICE_SIDES.items():
+        for qty in sizes:
+            base = best_of(per_die, qty, sides)
+            row = f"{name:>5} {qty:>9} {base * 1e3:>11.2f}"
+            for eng in engines.values():
+                t = best_of(eng.roll, qty, sides)
+                row += f" {t * 1e3:>9.2f} x{base / t:<4.0f}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
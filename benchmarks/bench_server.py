@@ -0,0 +1,79 @@
+"""Load test for the roll service on localhost.
+
+    python benchmarks/bench_server.py [clients] [rolls] [rolls_per_second]
+
+Starts a RollServer, connects many stand-in clients and publishes rolls from
+another thread, as the GUI would. Reports the cost of publish() for the
+caller, delivery latency and dropped messages.
+"""
+from __future__ import annotations
+import asyncio, sys, threading, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dndroller.netclient import listen
+from dndroller.server import RollServer
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float("nan")
+
+
+class _Last(Exception):
+    pass
+
+
+async def client(port: int, latencies: list):
+    def on_message(msg):
+        latencies.append(time.perf_counter() - msg["sent"])
+        if msg.get("last"):
+            raise _Last
+
+    try:
+        await listen("127.0.0.1", port, on_message)
+    except _Last:
+        pass
+
+
+async def run(clients: int, rolls: int, rate: int):
+    server = RollServer("127.0.0.1", 0).start()
+    latencies = []
+    tasks = [asyncio.create_task(client(server.port, latencies)) for _ in range(clients)]
+    while server.clients < clients:
+        await asyncio.sleep(0.01)
+    publish_cost = []
+
+    def publisher():
+        start = time.perf_counter()
+        for i in range(rolls):
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            t0 = time.perf_counter()
+            server.publish({"type": "roll", "text": f"d20[{i % 20 + 1}]", "total": i % 20 + 1,
+                            "sent": t0, "last": i == rolls - 1})
+            publish_cost.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    th = threading.Thread(target=publisher)
+    th.start()
+    done, pending = await asyncio.wait(tasks, timeout=30)
+    elapsed = time.perf_counter() - t0
+    th.join()
+    for t in pending:
+        t.cancel()
+    server.stop()
+    print(f"{clients} clients × {rolls} rolls at {rate}/s in {elapsed:.2f} s: "
+          f"{len(latencies):,} delivered, {server.dropped} dropped, "
+          f"{len(pending)} clients unfinished")
+    print(f"publish() cost   p50 {pct(publish_cost, .5) * 1e6:6.1f} µs   "
+          f"p99 {pct(publish_cost, .99) * 1e6:6.1f} µs")
+    print(f"delivery latency p50 {pct(latencies, .5) * 1e3:6.1f} ms   "
+          f"p99 {pct(latencies, .99) * 1e3:6.1f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    asyncio.run(run(*(args + [300, 1000, 200][len(args):])))
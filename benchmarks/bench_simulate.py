@@ -0,0 +1,34 @@
+"""Speed-up of Monte Carlo simulation with the number of worker processes.
+
+    python benchmarks/bench_simulate.py [trials]
+"""
+from __future__ import annotations
+import os, sys, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dndroller.simulate import AttackScenario, simulate
+
+SCENARIO = AttackScenario(attack_bonus=7, target_ac=16, damage="2d6+4", mode="advantage")
+
+
+def main(argv):
+    trials = int(argv[0]) if argv else 2_000_000
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+    base = reference = None
+    for workers in counts:
+        t0 = time.perf_counter()
+        summary = simulate(SCENARIO, trials, seed=42, workers=workers)
+        dt = time.perf_counter() - t0
+        base = base or dt
+        reference = reference or summary
+        same = "same" if summary == reference else "DIFFERENT"
+        print(f"{workers:>2} workers {dt:7.2f} s  speed-up x{base / dt:4.2f}  "
+              f"({trials / dt:,.0f} trials/s, result {same})")
+    print(reference)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
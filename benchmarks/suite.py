@@ -0,0 +1,228 @@
+"""Benchmark suite for the roll, render, history and sound paths.
+
+    python benchmarks/suite.py run [-o results.json] [--tk] [--quick]
+    python benchmarks/suite.py compare old.json new.json [--threshold 0.25]
+
+Every stage runs headlessly. Canvas and Text widgets are replaced by stubs
+that accept the same calls, unless ``--tk`` is given (it needs a display,
+e.g. under ``xvfb-run``). Results are written as JSON: seconds per operation,
+keyed by ``stage/die/qty``. ``compare`` exits with status 1 when any case got
+slower than the threshold.
+"""
+from __future__ import annotations
+import argparse, json, platform, sys, tempfile, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dndroller import engine, expr
+from dndroller.audio import SoundPlayer
+from dndroller.board import DiceBoard, grid_layout
+from dndroller.dice import REGISTRY
+from dndroller.engine import DICE_SIDES, RollEngine
+from dndroller.history import Entry, HistoryView, RollLog
+from dndroller.scheduler import FrameClock
+from dndroller.stats import SessionStats
+
+SIZES = (1, 10, 100, 1000, 10_000)
+QUICK_SIZES = (1, 100, 10_000)
+WIDTH, HEIGHT = 1000, 420
+
+
+class StubCanvas:
+    def __init__(self):
+        self._next = 0
+
+    def _item(self, *args, **kw):
+        self._next += 1
+        return self._next
+
+    create_polygon = create_rectangle = create_text = _item
+
+    def coords(self, *args):
+        pass
+
+    def itemconfigure(self, *args, **kw):
+        pass
+
+    def delete(self, *args):
+        pass
+
+    def bind(self, *args):
+        pass
+
+    def after_idle(self, fn, *args):
+        return None
+
+    def winfo_width(self):
+        return WIDTH
+
+    def winfo_height(self):
+        return HEIGHT
+
+
+class StubText:
+    def __init__(self):
+        self.lines = 0
+
+    def config(self, **kw):
+        pass
+
+    def insert(self, index, text):
+        self.lines += text.count("\n")
+
+    def delete(self, a, b=None):
+        pass
+
+    def see(self, index):
+        pass
+
+    def yview(self, *args):
+        pass
+
+    def after_idle(self, fn, *args):
+        return None
+
+
+class ManualClock(FrameClock):
+    """FrameClock whose ticks are run synchronously by ``drain``."""
+
+    def __init__(self):
+        self._queue = []
+        self.now = 0.0
+        super().__init__(lambda ms, fn: self._queue.append(fn) or "job",
+                         lambda job: self._queue.clear(), clock=lambda: self.now)
+
+    def drain(self):
+        while self._queue:
+            self.now += self.interval_ms / 1e3
+            self._queue.pop(0)()
+
+
+def timeit(fn, min_time: float = 0.05, rounds: int = 5) -> float:
+    """Best per-call time over ``rounds`` rounds of at least ``min_time`` each."""
+    best = float("inf")
+    for _ in range(rounds):
+        n, t0 = 0, time.perf_counter()
+        while True:
+            fn()
+            n += 1
+            dt = time.perf_counter() - t0
+            if dt >= min_time:
+                break
+        best = min(best, dt / n)
+    return best
+
+
+def canvas_factory(use_tk: bool):
+    if not use_tk:
+        return StubCanvas, None
+    import tkinter as tk
+    root = tk.Tk()
+    root.geometry(f"{WIDTH}x{HEIGHT}")
+
+    def make():
+        for w in root.winfo_children():
+            w.destroy()
+        cv = tk.Canvas(root, width=WIDTH, height=HEIGHT, highlightthickness=0)
+        cv.pack(fill="both", expand=True)
+        root.update()
+        return cv
+    return make, root
+
+
+def run(sizes, use_tk: bool = False, log=print) -> dict:
+    results = {}
+    make_canvas, tk_root = canvas_factory(use_tk)
+
+    def record(key, seconds):
+        results[key] = seconds
+        log(f"{key:<28} {seconds * 1e6:12.1f} µs")
+
+    eng = RollEngine()
+    for die, sides in DICE_SIDES.items():
+        for qty in sizes:
+            record(f"roll/{die}/{qty}", timeit(lambda: eng.roll(qty, sides)))
+    for qty in sizes:
+        plan = expr.compile(f"{qty}d20kh{max(1, qty // 2)} + 2d6! + 3")
+        record(f"expr/mixed/{qty}", timeit(lambda: plan.roll(eng)))
+        record(f"layout/grid/{qty}", timeit(lambda: grid_layout(qty, WIDTH, HEIGHT, 200)))
+
+    for die, sides in DICE_SIDES.items():
+        for qty in sizes:
+            dice = [(sides, v) for v in eng.roll(qty, sides)]
+            clock = ManualClock()
+            board = DiceBoard(make_canvas(), clock, REGISTRY)
+
+            def render():
+                board.show(dice)
+                clock.drain()
+                if tk_root is not None:
+                    tk_root.update_idletasks()
+            record(f"render/{die}/{qty}", timeit(render))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for qty in sizes:
+            values = eng.roll(qty, 20)
+            entry = Entry(f"{qty}×d20 → " + " + ".join(map(str, values)), [(20, values)],
+                          0, sum(values))
+            view, log_file, stats = HistoryView(StubText()), RollLog(Path(tmp, f"{qty}.jsonl")), SessionStats()
+            record(f"history/view/{qty}", timeit(lambda: view.append(entry.text)))
+            record(f"history/log/{qty}", timeit(lambda: log_file.append(entry)))
+            record(f"history/stats/{qty}", timeit(lambda: stats.add(entry)))
+            log_file.close()
+
+    player = SoundPlayer(Path(__file__).resolve().parent.parent / "sounds" / "dice_sound.wav",
+                         min_interval=0)
+    player._play = player._play or (lambda: None)
+    record("sound/play/1", timeit(player.play))
+    player.close()
+    if tk_root is not None:
+        tk_root.destroy()
+    return results
+
+
+def compare(old: dict, new: dict, threshold: float) -> int:
+    regressions = 0
+    print(f"{'case':<28} {'old µs':>12} {'new µs':>12} {'change':>8}")
+    for key in sorted(set(old) & set(new)):
+        a, b = old[key], new[key]
+        change = b / a - 1 if a else 0.0
+        flag = ""
+        if change > threshold:
+            flag, regressions = "  REGRESSION", regressions + 1
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{key:<28} {a * 1e6:12.1f} {b * 1e6:12.1f} {change:+8.1%}{flag}")
+    for key in sorted(set(old) ^ set(new)):
+        print(f"{key:<28} only in {'old' if key in old else 'new'} run")
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = p.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run")
+    r.add_argument("-o", "--output", default="bench_results.json")
+    r.add_argument("--tk", action="store_true", help="render on real Tk canvases")
+    r.add_argument("--quick", action="store_true", help=f"only sizes {QUICK_SIZES}")
+    c = sub.add_parser("compare")
+    c.add_argument("old")
+    c.add_argument("new")
+    c.add_argument("--threshold", type=float, default=0.25)
+    args = p.parse_args(argv)
+    if args.cmd == "compare":
+        load = lambda path: json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+        return compare(load(args.old), load(args.new), args.threshold)
+    results = run(QUICK_SIZES if args.quick else SIZES, args.tk)
+    meta = {"python": platform.python_version(), "platform": platform.platform(),
+            "numpy": engine.HAVE_NUMPY, "tk": args.tk, "time": time.time()}
+    Path(args.output).write_text(json.dumps({"meta": meta, "results": results}, indent=1),
+                                 encoding="utf-8")
+    print(f"wrote {len(results)} results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Tk-free core of the DnD dice roller."""
@@ -0,0 +1,100 @@
+"""Dice sound playback off the Tk thread.
+
+The WAV file is read into memory once and played from there by winsound
+on Windows or simpleaudio elsewhere. Without simpleaudio, playsound is used
+as a fallback; it only takes a path, so it reopens and decodes the file on
+every roll. One daemon worker plays the sound; ``play`` only drops a request
+into a one-slot queue, so bursts of rolls coalesce into at most one pending
+sound. Requests closer together than ``MIN_INTERVAL`` are ignored.
+"""
+from __future__ import annotations
+import io, platform, queue, threading, time, wave
+from pathlib import Path
+from typing import Callable, Optional
+
+MIN_INTERVAL = 0.08  # seconds between two dice sounds
+
+if platform.system() == "Windows":
+    import winsound
+    sa = playsound = None
+else:
+    winsound = None
+    try:
+        import simpleaudio as sa
+    except ImportError:
+        sa = None
+    try:
+        from playsound import playsound
+    except ImportError:
+        playsound = None
+
+
+class SoundPlayer:
+    def __init__(self, path: Path, min_interval: float = MIN_INTERVAL):
+        self.path = Path(path)
+        self.min_interval = min_interval
+        self.problem: Optional[str] = None  # "no_file" or "no_sound"
+        self.played = self.dropped = 0
+        self._last = float("-inf")
+        self._queue: queue.Queue = queue.Queue(maxsize=1)
+        self._thread: Optional[threading.Thread] = None
+        self._play = self._load()
+
+    def _load(self) -> Optional[Callable[[], None]]:
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            self.problem = "no_file"
+            return None
+        if winsound is not None:
+            return lambda: winsound.PlaySound(data, winsound.SND_MEMORY)
+        if sa is not None:
+            try:
+                obj = sa.WaveObject.from_wave_read(wave.open(io.BytesIO(data)))
+            except Exception:
+                obj = None
+            if obj is not None:
+                return lambda: obj.play().wait_done()
+        if playsound is not None:
+            # playsound only takes a path, so it decodes the file every time
+            return lambda: playsound(str(self.path))
+        self.problem = "no_sound"
+        return None
+
+    @property
+    def available(self) -> bool:
+        return self._play is not None
+
+    def play(self) -> bool:
+        """Queue one sound; returns False if it was coalesced or rate-limited."""
+        if self._play is None:
+            return False
+        now = time.monotonic()
+        if now - self._last < self.min_interval:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(True)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self._last = now
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="dice-sound", daemon=True)
+            self._thread.start()
+        return True
+
+    def _run(self):
+        while self._queue.get():
+            try:
+                self._play()
+                self.played += 1
+            except Exception:
+                pass  # a broken audio device must not kill the worker
+
+    def close(self):
+        if self._thread is not None:
+            try:
+                self._queue.put_nowait(False)
+            except queue.Full:
+                pass
@@ -0,0 +1,208 @@
+"""Player dice board drawn on a single persistent canvas.
+
+The grid is solved in closed form: the best column count sits next to
+``sqrt(n * W / H)``, so only a few candidates are checked. Canvas items are
+kept between rolls and only dice whose slot, type or value changed are
+touched. When dice would get too small, the board switches to a compact
+grid and then to a histogram of faces. Dice are keyed as in
+:mod:`~dndroller.dice`; their shape, colour and face labels come from the
+registry passed in.
+"""
+from __future__ import annotations
+import math
+from collections import Counter
+from dataclasses import dataclass
+from itertools import cycle
+from operator import add
+from typing import List, Optional, Sequence, Tuple
+
+from .dice import DiceRegistry, Key
+from .scheduler import FrameClock
+from .sprites import ANGLE_STEPS, polygon_coords, value_font
+
+PAD = 16
+DICE_MIN = 48   # below this die size the compact grid is used
+GRID_MIN = 18   # below this cell size the histogram is used
+SPIN_SECONDS = 0.1
+
+Die = Tuple[Key, int]  # (die key, face)
+
+
+def grid_layout(n: int, width: int, height: int, base: int, pad: int = PAD) -> Tuple[int, int, int]:
+    """Return ``(cols, rows, size)`` fitting ``n`` square cells of at most ``base`` px."""
+    if n <= 0:
+        return 0, 0, base
+    width, height = max(width, 1), max(height, 1)
+    guess = math.sqrt(n * width / height)
+    best = (1, n, 0.0)
+    for cols in {max(1, min(n, c)) for c in (math.floor(guess) - 1, math.floor(guess),
+                                              math.ceil(guess), math.ceil(guess) + 1)}:
+        rows = -(-n // cols)
+        cell = min(width / cols, height / rows)
+        if cell > best[2]:
+            best = (cols, rows, cell)
+    cols, rows, cell = best
+    if cell >= base + pad:
+        # same as the old layout: fill the width first at full size
+        cols = max(1, min(n, int(width // (base + pad))))
+        return cols, -(-n // cols), base
+    return cols, rows, max(1, int(cell) - pad)
+
+
+@dataclass
+class _Slot:
+    shape: int
+    text: int
+    key: Key
+    value: int
+    x: float
+    y: float
+    size: int
+    angle: int = 0
+
+
+class DiceBoard:
+    def __init__(self, canvas, frame_clock: FrameClock, dice: DiceRegistry):
+        self.canvas = canvas
+        self.frame_clock = frame_clock
+        self.dice = dice
+        self.mode: Optional[str] = None
+        self.caption = "{n} dice — most common: {face} ×{count}"
+        self._slots: List[_Slot] = []
+        self._dice: List[Die] = []
+        self._resize_job = None
+        canvas.bind("<Configure>", self._on_resize)
+
+    def _area(self) -> Tuple[int, int]:
+        return self.canvas.winfo_width(), self.canvas.winfo_height()
+
+    def show(self, dice: Sequence[Die], animate: bool = True):
+        self._dice = list(dice)
+        self.frame_clock.clear()
+        width, height = self._area()
+        base = 200 if max((self.dice.sides(k) for k, _ in dice), default=0) < 100 else 220
+        cols, rows, size = grid_layout(len(dice), width, height, base)
+        mode = "dice" if size >= DICE_MIN else "grid" if size >= GRID_MIN else "histogram"
+        if mode != self.mode:
+            self.clear()
+            self.mode = mode
+        if mode == "histogram":
+            self._draw_histogram(width, height)
+            return
+        cell = size + PAD
+        x0 = (width - cols * cell) / 2 + PAD / 2
+        y0 = (height - rows * cell) / 2 + PAD / 2
+        spinning = []
+        for i, (key, value) in enumerate(dice):
+            r, c = divmod(i, cols)
+            slot = self._place(i, key, value, x0 + c * cell, y0 + r * cell, size)
+            if animate and mode == "dice":
+                spinning.append(slot)
+        for slot in self._slots[len(dice):]:
+            self.canvas.delete(slot.shape, slot.text)
+        del self._slots[len(dice):]
+        if spinning:
+            self._spin(spinning)
+
+    def clear(self):
+        self.frame_clock.clear()
+        self.canvas.delete("all")
+        self._slots.clear()
+        self.mode = None
+
+    def _shape_coords(self, key: Key, x: float, y: float, size: int, angle_idx: int = 0):
+        if self.mode == "grid":
+            return x, y, x + size, y + size
+        n = self.dice.style(key)[0]
+        return list(map(add, polygon_coords(n, size, angle_idx), (x, y) * n))
+
+    def _place(self, i: int, key: Key, value: int, x: float, y: float, size: int) -> _Slot:
+        cv = self.canvas
+        fill = self.dice.style(key)[1]
+        font = value_font(size) if self.mode == "dice" else ("Helvetica", max(7, size // 3))
+        if i >= len(self._slots):
+            if self.mode == "grid":
+                shape = cv.create_rectangle(self._shape_coords(key, x, y, size),
+                                            fill=fill, outline="gray40")
+            else:
+                shape = cv.create_polygon(self._shape_coords(key, x, y, size),
+                                          fill=fill, outline="black", width=2)
+            text = cv.create_text(x + size / 2, y + size / 2, text=self.dice.label(key, value), font=font)
+            slot = _Slot(shape, text, key, value, x, y, size)
+            self._slots.append(slot)
+            return slot
+        slot = self._slots[i]
+        moved = (slot.x, slot.y, slot.size) != (x, y, size)
+        if moved or slot.key != key or slot.angle:
+            cv.coords(slot.shape, *self._shape_coords(key, x, y, size))
+        if moved:
+            cv.coords(slot.text, x + size / 2, y + size / 2)
+        if slot.size != size:
+            cv.itemconfigure(slot.text, font=font)
+        if slot.key != key:
+            cv.itemconfigure(slot.shape, fill=fill)
+        if slot.value != value or slot.key != key:
+            cv.itemconfigure(slot.text, text=self.dice.label(key, value))
+        slot.key, slot.value, slot.x, slot.y, slot.size, slot.angle = key, value, x, y, size, 0
+        return slot
+
+    def _spin(self, slots: List[_Slot]):
+        frames = cycle(range(ANGLE_STEPS))
+        start = None
+
+        def step(now):
+            nonlocal start
+            start = now if start is None else start
+            done = now - start > SPIN_SECONDS
+            idx = 0 if done else next(frames)
+            for s in slots:
+                self.canvas.coords(s.shape, *self._shape_coords(s.key, s.x, s.y, s.size, idx))
+                s.angle = idx
+            return not done
+
+        self.frame_clock.add(step)
+
+    def _draw_histogram(self, width: int, height: int):
+        cv = self.canvas
+        cv.delete("all")
+        counts = Counter(v for _, v in self._dice)
+        kinds = {k for k, _ in self._dice}
+        only = next(iter(kinds)) if len(kinds) == 1 else None
+        fill = self.dice.style(only)[1] if only is not None else "gray75"
+        label = (lambda face: self.dice.label(only, face)) if only is not None else str
+        lo, hi = 1, max(map(self.dice.sides, kinds))
+        faces = hi - lo + 1
+        top = max(counts.values())
+        margin = 24
+        # dice with more faces than pixels share one bar per pixel column
+        bins = min(faces, max(1, int(width) - 2 * margin))
+        binned = Counter()
+        for face, c in counts.items():
+            binned[(face - lo) * bins // faces] += c
+        bar_top = max(binned.values())
+        bar_w = max(1.0, (width - 2 * margin) / bins)
+        label_every = max(1, math.ceil(28 / bar_w))
+        for b in range(bins):
+            x = margin + b * bar_w
+            h = (height - 2 * margin) * binned.get(b, 0) / bar_top
+            cv.create_rectangle(x, height - margin - h, x + bar_w, height - margin,
+                                fill=fill, outline="gray40" if bar_w > 3 else "")
+            if b % label_every == 0:
+                cv.create_text(x + bar_w / 2, height - margin / 2, text=label(lo - (-b * faces // bins)),
+                               font=("Helvetica", 9))
+        cv.create_text(margin, margin / 2, anchor="w", font=("Helvetica", 10, "bold"),
+                       text=self.caption.format(n=len(self._dice), face=label(counts.most_common(1)[0][0]),
+                                                count=top))
+
+    def redraw(self):
+        """Draw the current dice again without animation, e.g. after a caption change."""
+        if self._dice:
+            self.show(self._dice, animate=False)
+
+    def _on_resize(self, _event):
+        if self._resize_job is None and self._dice:
+            self._resize_job = self.canvas.after_idle(self._relayout)
+
+    def _relayout(self):
+        self._resize_job = None
+        self.redraw()
@@ -0,0 +1,135 @@
+"""Headless roller: ``python -m dndroller [options] [EXPR ...]``.
+
+Expressions come from the arguments, from ``--file`` or, failing both, from
+stdin, one per line. Each roll is written as one JSON object per line. The Tk
+GUI and the sound stack are only imported when the GUI is launched.
+"""
+from __future__ import annotations
+import argparse, json, sys
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO
+
+from . import engine, expr
+from .i18n import DEFAULT_LOCALE, available
+from .rng import BACKENDS
+from .protocol import DEFAULT_PORT
+
+
+def _values(term: expr.DiceTerm, faces: List[int]) -> List[int]:
+    return [term.die.value(f) for f in faces] if term.die else faces
+
+
+def result_record(res: expr.RollResult) -> dict:
+    return {
+        "expr": res.plan.text,
+        "total": res.total,
+        "terms": [{"dice": t.term.text, "rolls": _values(t.term, t.rolls), "kept": _values(t.term, t.kept)}
+                  for t in res.terms],
+        "constant": res.constant,
+    }
+
+
+def _lines(stream: TextIO) -> Iterator[str]:
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def roll_stream(exprs: Iterable[str], out: TextIO, repeat: int = 1,
+                text: bool = False, flush_each: bool = False,
+                publish: Optional[Callable[[dict], None]] = None,
+                eng: Optional[engine.RollEngine] = None) -> int:
+    """Roll every expression ``repeat`` times; returns the number of errors."""
+    errors = 0
+    dumps, write = json.dumps, out.write
+    for src in exprs:
+        try:
+            plan = expr.compile(src)
+        except expr.ExprError as e:
+            errors += 1
+            write(f"{src}: error: {e}\n" if text else dumps({"expr": src, "error": str(e)}) + "\n")
+            continue
+        for _ in range(repeat):
+            res = plan.roll(eng)
+            rec = result_record(res)
+            write(f"{res}\n" if text else dumps(rec) + "\n")
+            if publish:
+                publish({"type": "roll", "text": str(res), **rec})
+        if flush_each:
+            out.flush()
+    out.flush()
+    return errors
+
+
+def _parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="dndroller", description="Roll dice expressions headlessly.")
+    p.add_argument("exprs", nargs="*", metavar="EXPR", help="e.g. 4d6kh3 or '2d8! + 1d4 - 2'")
+    p.add_argument("-f", "--file", type=argparse.FileType("r", encoding="utf-8"),
+                   help="read expressions from a file, one per line ('-' for stdin)")
+    p.add_argument("-n", "--repeat", type=int, default=1, help="roll each expression N times")
+    p.add_argument("-t", "--text", action="store_true", help="plain text instead of JSON lines")
+    p.add_argument("--rng", choices=list(BACKENDS),
+                   help="entropy backend (default: system, i.e. os.urandom; seeded with --seed)")
+    p.add_argument("--seed", type=int, help="seed for the seeded/counter backends")
+    p.add_argument("--gui", action="store_true", help="launch the Tk dice roller")
+    p.add_argument("--lang", choices=available(), default=DEFAULT_LOCALE,
+                   help="with --gui: interface language")
+    p.add_argument("--profile", type=Path, metavar="FILE",
+                   help="with --gui: time hot paths and append p50/p95/p99 snapshots to FILE")
+    p.add_argument("--serve", type=int, nargs="?", const=DEFAULT_PORT, metavar="PORT",
+                   help="broadcast rolls to player devices over TCP (default port %d)" % DEFAULT_PORT)
+    p.add_argument("--host", default="0.0.0.0", help="address for --serve (default: all interfaces)")
+    return p
+
+
+def launch_gui(server=None, eng=None, profile=None, locale=DEFAULT_LOCALE):
+    from .gui import run
+    run(server, eng, profile, locale)
+
+
+def _start_server(args):
+    if args.serve is None:
+        return None
+    if not 0 <= args.serve <= 65535:
+        raise ValueError(f"port must be 0-65535, got {args.serve}")
+    from .server import RollServer
+    server = RollServer(args.host, args.serve).start()
+    print(f"dndroller: serving rolls on {args.host}:{server.port}", file=sys.stderr)
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    if args.repeat < 1:
+        print("dndroller: --repeat must be ≥ 1", file=sys.stderr)
+        return 2
+    try:
+        eng = engine.make_engine(args.rng or ("system" if args.seed is None else "seeded"),
+                                 args.seed)
+    except ValueError as e:
+        print(f"dndroller: {e}", file=sys.stderr)
+        return 2
+    try:
+        server = _start_server(args)
+    except (OSError, OverflowError, ValueError) as e:
+        print(f"dndroller: cannot serve: {e}", file=sys.stderr)
+        return 2
+    if args.gui:
+        launch_gui(server, eng, args.profile, args.lang)
+        return 0
+    if args.exprs:
+        source: Iterable[str] = args.exprs
+    else:
+        stream = args.file or sys.stdin
+        source = _lines(stream)
+    interactive = not args.exprs and args.file is None and sys.stdin.isatty()
+    try:
+        errors = roll_stream(source, sys.stdout, args.repeat, args.text, interactive,
+                             server and server.publish, eng)
+    except (BrokenPipeError, KeyboardInterrupt):
+        return 1
+    finally:
+        if server:
+            server.stop()
+    return 1 if errors else 0
@@ -0,0 +1,183 @@
+"""Die registry: standard, arbitrary-sided, weighted and labelled dice.
+
+Every die rolls a face number ``1..sides``; that is what the engine draws,
+what the log and statistics record and what the board is keyed on. A die
+may give each face a value other than its number (Fudge dice count −1, 0
+and +1), a label to show instead of the number, and integer weights.
+
+Plain ``dN`` dice are keyed by ``N`` and created on demand, so any size
+works. Registered dice with weights, values or labels are keyed by name.
+Sprite vertex counts and colours are derived when a key is first drawn and
+memoized, so registering a die costs one dict insert however many there
+are. Custom dice are loaded from ``<data dir>/dice.json``, a list of
+objects like::
+
+    {"name": "loaded d6", "sides": 6, "weights": [1, 1, 1, 1, 1, 3]}
+    {"name": "coin", "sides": 2, "labels": ["T", "H"], "values": [0, 1]}
+"""
+from __future__ import annotations
+import colorsys, json, zlib
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .engine import DICE_SIDES, RollEngine
+from .history import data_dir
+from .i18n import LocalizedError
+
+MAX_SIDES = 1_000_000
+Key = Union[int, str]  # sides for plain dice, the name for registered ones
+
+# vertex count and colour of the standard dice; other dice get generated ones
+STANDARD_STYLE = {4: (3, "#e0f7fa"), 6: (4, "#fff9c4"), 8: (6, "#ffe0b2"), 10: (6, "#dcedc8"),
+                  12: (6, "#d1c4e9"), 20: (8, "#ffcdd2"), 100: (8, "#c8e6c9")}
+
+
+@dataclass(frozen=True)
+class DieSpec:
+    name: str
+    sides: int
+    weights: Optional[Tuple[int, ...]] = None
+    values: Optional[Tuple[int, ...]] = None
+    labels: Optional[Tuple[str, ...]] = None
+    colour: Optional[str] = None
+
+    def __post_init__(self):
+        if not 1 <= self.sides <= MAX_SIDES:
+            raise LocalizedError("die_sides", name=self.name, max=MAX_SIDES)
+        for field in ("weights", "values", "labels"):
+            seq = getattr(self, field)
+            if seq is not None and len(seq) != self.sides:
+                raise LocalizedError("die_per_face", name=self.name, field=field, sides=self.sides)
+        if self.weights is not None and min(self.weights) < 1:
+            raise LocalizedError("die_weights", name=self.name)
+
+    @property
+    def plain(self) -> bool:
+        return self.weights is None and self.values is None and self.labels is None
+
+    @property
+    def key(self) -> Key:
+        return self.sides if self.plain else self.name
+
+    @cached_property
+    def _cumulative(self) -> List[int]:
+        return list(accumulate(self.weights))
+
+    def roll(self, eng: RollEngine, qty: int) -> List[int]:
+        """``qty`` face numbers; weighted faces come from one unbiased draw each."""
+        if self.weights is None:
+            return eng.roll(qty, self.sides)
+        cum = self._cumulative
+        return [bisect_left(cum, r) + 1 for r in eng.roll(qty, cum[-1])]
+
+    def value(self, face: int) -> int:
+        return self.values[face - 1] if self.values else face
+
+    def label(self, face: int) -> str:
+        return self.labels[face - 1] if self.labels else str(self.value(face))
+
+    def total(self, faces: Iterable[int]) -> int:
+        return sum(map(self.values.__getitem__, (f - 1 for f in faces))) if self.values else sum(faces)
+
+    def face(self, token: str) -> int:
+        """Face number for a typed value: a label, or the face number itself."""
+        if self.labels and token in self.labels:
+            return self.labels.index(token) + 1
+        return int(token)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "DieSpec":
+        tup = lambda k, t: tuple(map(t, d[k])) if d.get(k) is not None else None
+        return cls(str(d["name"]), int(d["sides"]), tup("weights", int), tup("values", int),
+                   tup("labels", str), d.get("colour"))
+
+
+@lru_cache(maxsize=1024)
+def plain(sides: int) -> DieSpec:
+    return DieSpec(f"d{sides}", sides)
+
+
+FUDGE = DieSpec("dF", 3, values=(-1, 0, 1), labels=("−", "0", "+"), colour="#eeeeee")
+
+
+def _generated_colour(key: Key) -> str:
+    # spread hues by the golden ratio so neighbouring sizes do not look alike
+    hue = (zlib.crc32(str(key).encode()) * 0.618033988749895) % 1.0
+    r, g, b = colorsys.hsv_to_rgb(hue, 0.22, 0.97)
+    return f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}"
+
+
+class DiceRegistry:
+    def __init__(self, specs: Iterable[DieSpec] = ()):
+        self._named: Dict[str, DieSpec] = {}
+        self._style: Dict[Key, Tuple[int, str]] = {}
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: DieSpec) -> DieSpec:
+        self._named[spec.name] = spec
+        self._style.pop(spec.key, None)
+        return spec
+
+    def names(self) -> List[str]:
+        return list(self._named)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._named
+
+    def get(self, name: str) -> DieSpec:
+        """Registered die by name; any other ``dN`` is a plain N-sided die."""
+        spec = self._named.get(name)
+        if spec is None:
+            if not (name[:1] == "d" and name[1:].isdigit()):
+                raise KeyError(name)
+            spec = plain(int(name[1:]))
+        return spec
+
+    def spec(self, key: Key) -> DieSpec:
+        return self._named[key] if isinstance(key, str) else plain(key)
+
+    def style(self, key: Key) -> Tuple[int, str]:
+        """``(polygon vertices, fill colour)`` for drawing ``key``."""
+        style = self._style.get(key)
+        if style is None:
+            spec = self.spec(key)
+            if spec.plain and spec.sides in STANDARD_STYLE:
+                style = STANDARD_STYLE[spec.sides]
+            else:
+                vertices = 3 if spec.sides <= 3 else min(12, 4 + spec.sides // 10 * 2)
+                style = (vertices, spec.colour or _generated_colour(key))
+            self._style[key] = style
+        return style
+
+    def sides(self, key: Key) -> int:
+        return key if isinstance(key, int) else self._named[key].sides
+
+    def label(self, key: Key, face: int) -> str:
+        return str(face) if isinstance(key, int) else self._named[key].label(face)
+
+    def load(self, path: Path) -> int:
+        """Register every die in a JSON file; returns how many. A missing file is fine."""
+        try:
+            with open(path, encoding="utf-8") as fh:
+                items = json.load(fh)
+        except FileNotFoundError:
+            return 0
+        try:
+            specs = [DieSpec.from_dict(d) for d in items]
+        except (KeyError, TypeError) as e:
+            raise LocalizedError("die_bad_def", path=path, error=e) from None
+        for spec in specs:
+            self.register(spec)
+        return len(specs)
+
+
+def default_dice_path() -> Path:
+    return data_dir() / "dice.json"
+
+
+REGISTRY = DiceRegistry([*(plain(s) for s in DICE_SIDES.values()), FUDGE])
@@ -0,0 +1,132 @@
+"""Bulk dice roll engine.
+
+Every request draws its dice from one entropy buffer instead of one
+``os.urandom`` call per die. Raw words are rejection-sampled so that
+``word % sides`` carries no modulo bias. NumPy is used when available.
+"""
+from __future__ import annotations
+import math, os
+from array import array
+from importlib.util import find_spec
+from typing import Callable, List, Optional
+
+from .rng import make_backend
+
+# NumPy is imported on first use so that headless startup stays cheap
+HAVE_NUMPY = find_spec("numpy") is not None
+np = None
+
+DICE_SIDES = {"d4": 4, "d6": 6, "d8": 8, "d10": 10, "d12": 12, "d20": 20, "d100": 100}
+
+CHUNK = 1 << 20  # dice per entropy draw, keeps memory flat for huge pools
+
+_WORDS = ((1, "B", "u1"), (2, "H", "<u2"), (4, "I", "<u4"), (8, "Q", "<u8"))
+
+
+def _load_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+def _word(sides: int):
+    for width, code, dtype in _WORDS:
+        if sides <= 1 << (8 * width):
+            return width, code, dtype
+    raise ValueError(f"Too many sides: {sides}")
+
+
+class RollEngine:
+    def __init__(self, entropy: Callable[[int], bytes] = os.urandom,
+                 use_numpy: Optional[bool] = None):
+        self.entropy = entropy
+        self.use_numpy = HAVE_NUMPY if use_numpy is None else use_numpy and HAVE_NUMPY
+
+    def _plan(self, need: int, sides: int):
+        width, code, dtype = _word(sides)
+        span = 1 << (8 * width)
+        limit = span - span % sides
+        # oversample by the expected rejection rate plus a little slack
+        n = math.ceil(need * span / limit * 1.02) + 16
+        return width, code, dtype, limit, n
+
+    def _chunk_list(self, need: int, sides: int) -> List[int]:
+        width, code, _, limit, n = self._plan(need, sides)
+        out: List[int] = []
+        while len(out) < need:
+            words = memoryview(self.entropy(n * width)).cast(code)
+            out += [w % sides + 1 for w in words if w < limit]
+            n = math.ceil((need - len(out)) * 1.1) + 16
+        del out[need:]
+        return out
+
+    def _chunk_array(self, need: int, sides: int):
+        _load_numpy()
+        width, _, dtype, limit, n = self._plan(need, sides)
+        parts, got = [], 0
+        while got < need:
+            words = np.frombuffer(self.entropy(n * width), dtype=dtype)
+            words = words[words < limit]
+            parts.append(words)
+            got += words.size
+            n = math.ceil((need - got) * 1.1) + 16
+        words = np.concatenate(parts)[:need] if len(parts) > 1 else parts[0][:need]
+        # widen first: sides == 256 does not fit a u1 word, nor 256 + 1 the result
+        return (words.astype(np.uint64) % np.uint64(sides) + np.uint64(1)).astype(np.int64)
+
+    def roll_array(self, qty: int, sides: int):
+        """Roll ``qty`` dice as a NumPy array, or an ``array('q')`` without NumPy."""
+        if qty < 0 or sides < 1:
+            raise ValueError("Quantity must be ≥ 0 and sides ≥ 1.")
+        if self.use_numpy:
+            _load_numpy()
+            if qty <= CHUNK:
+                return self._chunk_array(qty, sides)
+            return np.concatenate([self._chunk_array(min(CHUNK, qty - i), sides)
+                                   for i in range(0, qty, CHUNK)])
+        out = array("q")
+        for i in range(0, qty, CHUNK):
+            out.extend(self._chunk_list(min(CHUNK, qty - i), sides))
+        return out
+
+    def roll(self, qty: int, sides: int) -> List[int]:
+        if qty < 0 or sides < 1:
+            raise ValueError("Quantity must be ≥ 0 and sides ≥ 1.")
+        if self.use_numpy and qty > 64:
+            return self.roll_array(qty, sides).tolist()
+        out: List[int] = []
+        for i in range(0, qty, CHUNK):
+            out += self._chunk_list(min(CHUNK, qty - i), sides)
+        return out
+
+    def counts(self, qty: int, sides: int) -> List[int]:
+        """Face histogram of ``qty`` dice; index 0 is face 1."""
+        hist = [0] * sides
+        for i in range(0, qty, CHUNK):
+            n = min(CHUNK, qty - i)
+            if self.use_numpy:
+                _load_numpy()
+                add = np.bincount(self._chunk_array(n, sides) - 1, minlength=sides).tolist()
+            else:
+                add = [0] * sides
+                for v in self._chunk_list(n, sides):
+                    add[v - 1] += 1
+            hist = [a + b for a, b in zip(hist, add)]
+        return hist
+
+    def total(self, qty: int, sides: int) -> int:
+        return sum(face * c for face, c in enumerate(self.counts(qty, sides), 1))
+
+
+def make_engine(backend: str = "system", seed: Optional[int] = None) -> RollEngine:
+    """Engine drawing from a named :mod:`~dndroller.rng` backend."""
+    return RollEngine(make_backend(backend, seed).randbytes)
+
+
+ENGINE = RollEngine()
+
+
+def roll(qty: int, sides: int) -> List[int]:
+    return ENGINE.roll(qty, sides)
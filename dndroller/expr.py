@@ -0,0 +1,224 @@
+"""Dice expressions such as ``4d6kh3 + 2d8! + 1d4 - 2``.
+
+Grammar (case-insensitive, whitespace ignored)::
+
+    expr   := term (("+" | "-") term)*
+    term   := INT | [INT] "d" (INT | "%" | "F") suffix*
+    suffix := "kh" INT | "kl" INT | "k" INT | "dh" INT | "dl" INT
+            | "!" | "r" INT
+
+``k``/``kh`` keep the highest dice, ``kl`` the lowest, ``dh``/``dl`` drop them.
+``!`` explodes on the maximum face and ``rN`` rerolls, once, every die
+showing N or less. ``dN`` works for any N up to ``dice.MAX_SIDES`` and ``dF``
+is a Fudge die (−1, 0, +1). An expression is compiled once into a :class:`Plan`;
+``compile`` keeps recently used plans in an LRU cache.
+"""
+from __future__ import annotations
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from . import engine
+from .dice import MAX_SIDES, REGISTRY, DieSpec, plain
+from .i18n import LocalizedError
+
+MAX_DICE = 1_000_000
+MAX_EXPLOSIONS = 100  # rounds of explosion per term, guards d1!
+
+_TOKEN = re.compile(r"\s*(?:(?P<dice>(?P<qty>\d*)d(?P<sides>\d+|%|f)"
+                    r"(?P<suffix>(?:kh\d+|kl\d+|k\d+|dh\d+|dl\d+|!|r\d+)*))"
+                    r"|(?P<int>\d+)|(?P<op>[+-]))", re.I)
+_SUFFIX = re.compile(r"(kh|kl|k|dh|dl|r)(\d+)|(!)", re.I)
+
+
+class ExprError(LocalizedError):
+    pass
+
+
+@dataclass(frozen=True)
+class DiceTerm:
+    sign: int
+    qty: int
+    sides: int
+    keep: Optional[Tuple[str, int]] = None  # ("h" | "l", count)
+    explode: bool = False
+    reroll: int = 0
+    text: str = ""
+    die: Optional[DieSpec] = None  # only for dice whose faces are not plain numbers
+
+    @property
+    def key(self):
+        return self.die.key if self.die else self.sides
+
+    def _roll(self, eng: engine.RollEngine, qty: int) -> List[int]:
+        return self.die.roll(eng, qty) if self.die else eng.roll(qty, self.sides)
+
+    def roll(self, eng: engine.RollEngine) -> "TermResult":
+        rolls = self._roll(eng, self.qty)
+        if self.reroll:
+            low = [i for i, v in enumerate(rolls) if v <= self.reroll]
+            for i, v in zip(low, self._roll(eng, len(low))):
+                rolls[i] = v
+        if self.explode and self.sides > 1:
+            fresh = rolls
+            for _ in range(MAX_EXPLOSIONS):
+                fresh = self._roll(eng, fresh.count(self.sides))
+                if not fresh:
+                    break
+                rolls = rolls + fresh
+        kept = rolls
+        if self.keep:
+            mode, n = self.keep
+            order = sorted(range(len(rolls)), key=rolls.__getitem__, reverse=mode == "h")
+            keep_idx = set(order[:n])
+            kept = [v for i, v in enumerate(rolls) if i in keep_idx]
+        return TermResult(self, rolls, kept)
+
+
+@dataclass
+class TermResult:
+    term: DiceTerm
+    rolls: List[int]
+    kept: List[int]
+
+    @property
+    def total(self) -> int:
+        die = self.term.die
+        return self.term.sign * (die.total(self.kept) if die else sum(self.kept))
+
+    def __str__(self) -> str:
+        label = self.term.die.label if self.term.die else str
+        if len(self.kept) == len(self.rolls):
+            shown = map(label, self.rolls)
+        else:
+            left = list(self.kept)
+            shown = []
+            for v in self.rolls:
+                if v in left:
+                    left.remove(v)
+                    shown.append(label(v))
+                else:
+                    shown.append(f"({label(v)})")
+        return f"{self.term.text}[{', '.join(shown)}]"
+
+
+@dataclass
+class RollResult:
+    plan: "Plan"
+    terms: List[TermResult]
+
+    @property
+    def constant(self) -> int:
+        return self.plan.constant
+
+    @property
+    def total(self) -> int:
+        return sum(t.total for t in self.terms) + self.constant
+
+    @property
+    def dice(self) -> List[Tuple[int, int]]:
+        """Kept dice as ``(die key, face)`` pairs, in expression order."""
+        return [(t.term.key, v) for t in self.terms for v in t.kept]
+
+    @property
+    def rolled(self) -> List[Tuple[int, int]]:
+        """Every die thrown, kept or not; rerolled terms are left out as their faces are biased."""
+        return [(t.term.key, v) for t in self.terms if not t.term.reroll for v in t.rolls]
+
+    def __str__(self) -> str:
+        parts = [(t.term.sign, str(t)) for t in self.terms]
+        if self.constant or not parts:
+            parts.append((-1 if self.constant < 0 else 1, str(abs(self.constant))))
+        out = ("-" if parts[0][0] < 0 else "") + parts[0][1]
+        for sign, text in parts[1:]:
+            out += f" {'-' if sign < 0 else '+'} {text}"
+        return f"{out} = {self.total}"
+
+
+@dataclass(frozen=True)
+class Plan:
+    text: str
+    terms: Tuple[DiceTerm, ...]
+    constant: int = 0
+    dice_count: int = field(default=0, compare=False)
+
+    def roll(self, eng: Optional[engine.RollEngine] = None) -> RollResult:
+        eng = eng or engine.ENGINE
+        return RollResult(self, [t.roll(eng) for t in self.terms])
+
+
+def _die(raw: str) -> DieSpec:
+    if raw in ("%", "f"):
+        return REGISTRY.get("d100" if raw == "%" else "dF")
+    if not 1 <= int(raw) <= MAX_SIDES:
+        raise ExprError("expr_sides", max=MAX_SIDES, n=int(raw))
+    return plain(int(raw))
+
+
+def _dice_term(sign: int, m: re.Match) -> DiceTerm:
+    qty = int(m["qty"] or 1)
+    die = _die(m["sides"].lower())
+    sides = die.sides
+    keep, explode, reroll = None, False, 0
+    for s in _SUFFIX.finditer(m["suffix"]):
+        op, n = (s[1] or "").lower(), int(s[2] or 0)
+        if s[3]:
+            explode = True
+        elif op == "r":
+            if n >= sides:
+                raise ExprError("expr_reroll_all", n=n, sides=sides)
+            reroll = n
+        else:
+            if keep:
+                raise ExprError("expr_one_keep")
+            if op in ("k", "kh", "dl"):
+                keep = ("h", n if op != "dl" else qty - n)
+            else:
+                keep = ("l", n if op == "kl" else qty - n)
+            if not 0 <= keep[1] <= qty:
+                raise ExprError("expr_keep_count", keep=keep[1], qty=qty)
+    return DiceTerm(sign, qty, sides, keep, explode, reroll, m["dice"].lower(),
+                    None if die.plain else die)
+
+
+@lru_cache(maxsize=512)
+def _compile(text: str) -> Plan:
+    terms, constant, dice, pos = [], 0, 0, 0
+    sign, seen = None, False
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m:
+            raise ExprError("expr_unexpected", pos=pos + 1, rest=text[pos:])
+        pos = m.end()
+        if m["op"]:
+            if sign is not None:
+                raise ExprError("expr_two_ops")
+            sign = -1 if m["op"] == "-" else 1
+            continue
+        if seen and sign is None:
+            raise ExprError("expr_missing_op")
+        if m["dice"]:
+            term = _dice_term(sign or 1, m)
+            dice += term.qty
+            terms.append(term)
+        else:
+            constant += (sign or 1) * int(m["int"])
+        sign, seen = None, True
+    if sign is not None or not seen:
+        raise ExprError("expr_incomplete")
+    if dice > MAX_DICE:
+        raise ExprError("expr_max_dice", max=MAX_DICE)
+    return Plan(text, tuple(terms), constant, dice)
+
+
+def compile(text: str) -> Plan:
+    """Parse ``text`` once and return a reusable, cached roll plan."""
+    return _compile(" ".join(text.split()).lower())
+
+
+def roll(text: str, eng: Optional[engine.RollEngine] = None) -> RollResult:
+    return compile(text).roll(eng)
+
+
+cache_info = _compile.cache_info
@@ -0,0 +1,475 @@
+from __future__ import annotations
+import sys, tkinter as tk
+from dataclasses import asdict
+from typing import Callable, List, NamedTuple
+from pathlib import Path
+from tkinter import ttk, messagebox, filedialog
+
+from . import engine, expr, i18n
+from .audio import SoundPlayer
+from .board import DiceBoard
+from .dice import REGISTRY, DieSpec, default_dice_path
+from .history import FLUSH_SECONDS, RING_SIZE, Entry, HistoryView, RollLog, group_dice, read_tail
+from .i18n import DEFAULT_LOCALE, LocalizedError, Translator
+from .instrument import Profiler
+from .pipeline import RollPipeline
+from .replay import SUFFIX, Record, Replayer, SessionRecorder, sessions_dir
+from .scheduler import FrameClock
+from .server import RollServer
+from .stats import SessionStats
+from .tables import MAX_POOL, OddsTables
+from .sprites import regular_polygon
+
+class RollOutcome(NamedTuple):
+    entry: Entry
+    results: List[int]
+    sides: int | List[int]
+    label: str
+    signs: List[int] | None = None  # per die, for expressions that subtract dice
+    seconds: float = 0.0  # time the worker spent generating it
+
+
+def _dice_outcome(die: DieSpec, results: List[int], mod: int, mode: str) -> RollOutcome:
+    total = die.total(results) + mod
+    shown = f"[{', '.join(map(die.label, results))}]" if die.labels else ' + '.join(map(die.label, results))
+    text = (f"{len(results)}×{die.name} → {shown}"
+            f"{f' + {mod}' if mod else ''} = {total}")
+    return RollOutcome(Entry(text, [(die.key, results)], mod, total, mode), results, die.key, die.name)
+
+
+def _expr_outcome(res: expr.RollResult) -> RollOutcome:
+    dice, rolled = group_dice(res.dice), group_dice(res.rolled)
+    entry = Entry(str(res), dice, res.constant, res.total, rolled=rolled if rolled != dice else None)
+    signs = [t.term.sign for t in res.terms for _ in t.kept]
+    return RollOutcome(entry, [v for _, v in res.dice], [k for k, _ in res.dice], res.plan.text, signs)
+
+
+def resource_path(rel: str) -> str:
+    base = getattr(sys, "_MEIPASS", Path(__file__).resolve().parent.parent)
+    return str(Path(base, rel))
+
+SOUND_FILE = Path(resource_path("sounds/dice_sound.wav"))
+TIMINGS_REFRESH_MS = 500
+TIMINGS_EXPORT_MS = 10_000
+MAX_QTY = 10_000
+MAX_TERMS = 40  # longer rolls are summarised on the player display
+REPLAY_SPEEDS = ("0.5", "1", "2", "4", "10")
+
+class DiceRoller:
+    DICE = REGISTRY
+
+    def __init__(self, root: tk.Tk, server: RollServer | None = None,
+                 roll_engine: engine.RollEngine | None = None, profile: Path | None = None,
+                 locale: str = DEFAULT_LOCALE):
+        self.root = root
+        self.server = server
+        self.roll_engine = roll_engine or engine.ENGINE
+        self.tr = Translator(locale)
+        self._ui_text: dict[str, tk.StringVar] = {}
+        self._die_label = "—"
+        self.root.title(self.tr("title_control"))
+        self._icon_img: tk.PhotoImage | None = None
+        try:
+            ico_path = resource_path("files/d20.ico")
+            self._icon_img = tk.PhotoImage(file=ico_path)
+            self.root.iconphoto(True, self._icon_img)
+        except Exception:
+            try:
+                self.root.iconbitmap(ico_path)
+            except Exception:
+                pass
+        self.frame_clock = FrameClock(self.root.after, self.root.after_cancel)
+        self.pipeline = RollPipeline(self.root.after, self.root.after_idle,
+                                     self._apply_result, self._apply_latest, self._on_roll_error)
+        self.roll_log = RollLog()
+        self.recorder = SessionRecorder()
+        self.replayer: Replayer | None = None
+        self.stats = SessionStats()
+        self.sound = SoundPlayer(SOUND_FILE)
+        try:
+            self.DICE.load(default_dice_path())
+        except (OSError, ValueError) as e:
+            self._warn_once("no_dice", self.tr("no_dice", error=self._error_text(e)))
+        self._odds: OddsTables | None = None
+        self._build_display_window()
+        self._build_control_ui()
+        self.history_view = HistoryView(self.history)
+        self.history_view.extend([self._history_line(e) for e in read_tail(self.roll_log.path, RING_SIZE)])
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after(int(FLUSH_SECONDS * 1000), self._flush_history)
+        self._setup_profiler(profile)
+
+    def _build_display_window(self):
+        self.display = tk.Toplevel(self.root)
+        self.display.title(self.tr("title_display"))
+        self.display.geometry("1020x520")
+
+        if self._icon_img:
+            try:
+                self.display.iconphoto(True, self._icon_img)
+            except Exception:
+                pass
+
+        self.die_type_label = tk.Label(self.display, text=self.tr("type_label", die=self._die_label),
+                                       font=("Helvetica", 14, "bold"),
+                                       fg="gray25", bg=self.display.cget("bg"))
+        self.die_type_label.pack(anchor="nw", padx=12, pady=10)
+
+        self.board_canvas = tk.Canvas(self.display, highlightthickness=0,
+                                      bg=self.display.cget("bg"))
+        self.board_canvas.pack(expand=True, fill="both", padx=10, pady=10)
+        self.board = DiceBoard(self.board_canvas, self.frame_clock, self.DICE)
+        self.board.caption = self.tr("histogram_caption")
+
+        self.total_text = tk.Text(self.display, height=1, bd=0,
+                                  bg=self.display.cget("bg"),
+                                  font=("Helvetica", 28, "bold"),
+                                  highlightthickness=0)
+        self.total_text.tag_configure("mod", foreground="red")
+        self.total_text.config(state="disabled")
+        self.total_text.pack(side="bottom", pady=6, fill="x")
+
+    def _build_control_ui(self):
+        fr = ttk.Frame(self.root, padding=10)
+        fr.pack(fill="x")
+        ttk.Label(fr, textvariable=self._ui("die_type")).grid(row=0, column=0, sticky="w")
+        self.die_var = tk.StringVar(value="d20")
+        ttk.Combobox(fr, textvariable=self.die_var, values=self.DICE.names(), state="readonly",
+                     width=12).grid(row=0, column=1, sticky="w", padx=5)
+        ttk.Label(fr, textvariable=self._ui("quantity")).grid(row=1, column=0, sticky="w")
+        self.qty_var = tk.StringVar(value="1")
+        ttk.Spinbox(fr, from_=1, to=MAX_QTY, textvariable=self.qty_var, width=6).grid(row=1, column=1, sticky="w", padx=5)
+        ttk.Label(fr, textvariable=self._ui("modifier")).grid(row=2, column=0, sticky="w")
+        self.mod_var = tk.StringVar()
+        ttk.Entry(fr, textvariable=self.mod_var, width=8).grid(row=2, column=1, sticky="w", padx=5)
+        ttk.Label(fr, textvariable=self._ui("modifier_hint")).grid(row=2, column=2, sticky="w")
+        self.mode_var = tk.StringVar(value="random")
+        ttk.Radiobutton(fr, textvariable=self._ui("random"), variable=self.mode_var, value="random").grid(row=3, column=0, sticky="w")
+        ttk.Radiobutton(fr, textvariable=self._ui("forced"), variable=self.mode_var, value="force").grid(row=3, column=1, sticky="w")
+        ttk.Label(fr, textvariable=self._ui("forced_values")).grid(row=4, column=0, sticky="w")
+        self.force_entry = ttk.Entry(fr, width=28)
+        self.force_entry.grid(row=4, column=1, sticky="w", padx=5)
+        ttk.Label(fr, textvariable=self._ui("forced_hint")).grid(row=4, column=2, sticky="w")
+        ttk.Label(fr, textvariable=self._ui("expression")).grid(row=5, column=0, sticky="w")
+        self.expr_var = tk.StringVar()
+        ttk.Entry(fr, textvariable=self.expr_var, width=28).grid(row=5, column=1, sticky="w", padx=5)
+        ttk.Label(fr, textvariable=self._ui("expression_hint")).grid(row=5, column=2, sticky="w")
+        ttk.Button(fr, textvariable=self._ui("roll"), command=lambda: self.roll()).grid(row=6, column=0, columnspan=2, pady=12)
+        ttk.Button(fr, textvariable=self._ui("statistics"), command=self.show_stats).grid(row=6, column=2, sticky="w")
+        ttk.Button(fr, textvariable=self._ui("odds"), command=self.show_odds).grid(row=6, column=3, sticky="w")
+        ttk.Label(fr, textvariable=self._ui("language")).grid(row=7, column=0, sticky="w")
+        self.locale_var = tk.StringVar(value=self.tr.locale)
+        ttk.OptionMenu(fr, self.locale_var, self.tr.locale, *i18n.available(),
+                       command=self.set_locale).grid(row=7, column=1, sticky="w", padx=5)
+        ttk.Button(fr, textvariable=self._ui("replay"), command=self.toggle_replay).grid(row=8, column=0, sticky="w", pady=(8, 0))
+        ttk.Label(fr, textvariable=self._ui("replay_speed")).grid(row=8, column=1, sticky="e", pady=(8, 0))
+        self.speed_var = tk.StringVar(value="1")
+        ttk.OptionMenu(fr, self.speed_var, "1", *REPLAY_SPEEDS,
+                       command=self._set_replay_speed).grid(row=8, column=2, sticky="w", padx=5, pady=(8, 0))
+        self.history = tk.Text(self.root, height=12, width=70, state="disabled")
+        self.history.pack(padx=10, pady=5, fill="both", expand=True)
+        self.timings_label = tk.Label(self.root, font=("Courier", 9), justify="left", anchor="w")
+
+    def _ui(self, key: str) -> tk.StringVar:
+        var = self._ui_text.get(key)
+        if var is None:
+            var = self._ui_text[key] = tk.StringVar(value=self.tr(key))
+        return var
+
+    def set_locale(self, locale: str):
+        """Relabel every widget in place; nothing is rebuilt."""
+        self.tr.set_locale(locale)
+        for key, var in self._ui_text.items():
+            var.set(self.tr(key))
+        self.root.title(self.tr("title_control"))
+        self.display.title(self.tr("title_display"))
+        self.die_type_label.config(text=self.tr("type_label", die=self._die_label))
+        self.board.caption = self.tr("histogram_caption")
+        if self.board.mode == "histogram":
+            self.board.redraw()
+
+    def roll(self):
+        if self.expr_var.get().strip():
+            self.roll_expression(self.expr_var.get())
+            return
+        try:
+            qty = int(self.qty_var.get())
+        except ValueError:
+            qty = 0
+        if not 1 <= qty <= MAX_QTY:
+            messagebox.showerror(self.tr("error"), self.tr("err_quantity", max=MAX_QTY))
+            return
+        try:
+            mod = int(self.mod_var.get().strip() or 0)
+        except ValueError:
+            messagebox.showerror(self.tr("error"), self.tr("err_modifier"))
+            return
+
+        die, mode = self.DICE.get(self.die_var.get()), self.mode_var.get()
+        if mode == "random":
+            eng = self.roll_engine
+            self._submit(lambda: _dice_outcome(die, die.roll(eng, qty), mod, mode))
+        else:
+            results = self._parse_forced_results(qty, die)
+            if results is None:
+                return
+            outcome = _dice_outcome(die, results, mod, mode)
+            self._submit(lambda: outcome)
+
+    def roll_expression(self, text: str):
+        try:
+            plan = expr.compile(text)
+        except expr.ExprError as e:
+            messagebox.showerror(self.tr("error"), e.text(self.tr))
+            return
+        eng = self.roll_engine
+        self._submit(lambda: _expr_outcome(plan.roll(eng)))
+
+    def _submit(self, make: Callable[[], RollOutcome]):
+        clock = self.profiler.clock
+
+        def job():
+            # runs on the worker; the sample is recorded on the Tk thread in _apply_result
+            t0 = clock()
+            outcome = make()
+            return outcome._replace(seconds=clock() - t0)
+        self.pipeline.submit(job)
+
+    def _apply_result(self, outcome: RollOutcome):
+        if self.profiler.enabled:
+            self.profiler.record("generate", outcome.seconds)
+        self._append_history(outcome.entry, outcome.label, outcome.signs)
+
+    def _apply_latest(self, outcome: RollOutcome):
+        self._play_sound()
+        self._update_display(outcome.results, outcome.sides, outcome.entry.mod,
+                             outcome.entry.total, label=outcome.label, signs=outcome.signs)
+
+    def _error_text(self, exc: BaseException) -> str:
+        return exc.text(self.tr) if isinstance(exc, LocalizedError) else str(exc)
+
+    def _on_roll_error(self, exc: BaseException):
+        messagebox.showerror(self.tr("error"), self.tr("roll_failed", error=self._error_text(exc)))
+
+    def _update_display(self, results, sides, mod, total, label=None, signs=None):
+        self._die_label = label or self.die_var.get()
+        self.die_type_label.config(text=self.tr("type_label", die=self._die_label))
+        die_sides = sides if isinstance(sides, list) else [sides] * len(results)
+        if self.board.mode is None:
+            self.display.update_idletasks()
+        self.board.show(list(zip(die_sides, results)))
+
+        self.total_text.config(state="normal")
+        self.total_text.delete("1.0", "end")
+        if len(results) > MAX_TERMS:
+            self.total_text.insert("end", self.tr("pool_total", n=len(results), total=total - mod))
+        else:
+            labels = list(map(self.DICE.label, die_sides, results))
+            signs = signs or [1] * len(labels)
+            text = ("-" if signs and signs[0] < 0 else "") + "".join(labels[:1])
+            for i in range(1, len(labels)):
+                key = die_sides[i]
+                # labelled faces like Fudge's "+" and "-" read badly between "+" signs,
+                # so dice of one labelled group are only spaced apart
+                if (key, signs[i]) == (die_sides[i - 1], signs[i - 1]) and self._labelled(key):
+                    text += "  " + labels[i]
+                else:
+                    text += f" {'-' if signs[i] < 0 else '+'} {labels[i]}"
+            self.total_text.insert("end", text)
+        if mod:
+            sign = "+" if mod >= 0 else "-"
+            self.total_text.insert("end", f" {sign} ")
+            self.total_text.insert("end", str(abs(mod)), ("mod",))
+        if len(results) + (1 if mod else 0) > 1:
+            self.total_text.insert("end", f" = {total}")
+        self.total_text.config(state="disabled")
+
+    def _labelled(self, key) -> bool:
+        return not isinstance(key, int) and self.DICE.spec(key).labels is not None
+
+    def _play_sound(self):
+        if self.sound.problem == "no_file":
+            self._warn_once("no_file", self.tr("no_sound_file", path=SOUND_FILE))
+        elif self.sound.problem == "no_sound":
+            self._warn_once("no_sound", self.tr("no_sound"))
+        else:
+            self.sound.play()
+
+    _warned: set[str] = set()
+    def _warn_once(self, key: str, msg: str):
+        if key in self._warned:
+            return
+        self._warned.add(key)
+        messagebox.showwarning(self.tr("warning"), msg)
+
+    def _parse_forced_results(self, qty, die: DieSpec):
+        txt = self.force_entry.get().strip()
+        if not txt:
+            messagebox.showerror(self.tr("no_values_title"), self.tr("no_values"))
+            return None
+        try:
+            vals = [die.face(x.strip()) for x in txt.split(",") if x.strip()]
+        except ValueError:
+            messagebox.showerror(self.tr("error"), self.tr("err_integers"))
+            return None
+        if len(vals) == 1:
+            vals *= qty
+        if len(vals) != qty:
+            messagebox.showerror(self.tr("error"), self.tr("err_count", qty=qty))
+            return None
+        bad = [v for v in vals if not (1 <= v <= die.sides)]
+        if bad:
+            messagebox.showerror(self.tr("error"), self.tr("err_range", bad=bad, sides=die.sides))
+            return None
+        return vals
+
+    def _history_line(self, entry: Entry) -> str:
+        return f"{entry.text}  {self.tr('forced_mark')}" if entry.mode == "force" else entry.text
+
+    def _append_history(self, entry: Entry, label: str, signs: List[int] | None = None):
+        self.history_view.append(self._history_line(entry))
+        self.stats.add(entry)
+        if self.server:
+            self.server.publish({"type": "roll", **asdict(entry)})
+        try:
+            self.roll_log.append(entry)
+        except OSError as e:
+            self._warn_once("no_log", self.tr("no_log", error=e))
+        try:
+            self.recorder.append(entry, label, signs)
+        except (OSError, ValueError) as e:
+            self._warn_once("no_record", self.tr("no_record", error=e))
+
+    def show_stats(self):
+        messagebox.showinfo(self.tr("stats_title"), self.stats.report(tr=self.tr))
+
+    def show_odds(self):
+        die = self.die_var.get()
+        spec = self.DICE.get(die)
+        sides = spec.sides
+        if not spec.plain or sides not in engine.DICE_SIDES.values():
+            messagebox.showinfo(self.tr("odds"), self.tr("no_odds_die", die=die))
+            return
+        if self._odds is None:
+            try:
+                self._odds = OddsTables.load()
+            except (OSError, ValueError) as e:
+                messagebox.showerror(self.tr("error"), self.tr("no_odds", error=e))
+                return
+        lines = [self.tr("odds_header")]
+        step = max(1, sides // 20)
+        for t in range(max(2, step), sides + 1, step):
+            n, a, d = (self._odds.at_least(sides, t, m) for m in ("normal", "advantage", "disadvantage"))
+            lines.append(f"≥{t:<5}{n:8.1%}{a:8.1%}{d:8.1%}")
+        try:
+            qty = int(self.qty_var.get())
+        except ValueError:
+            qty = 1
+        if 2 <= qty <= MAX_POOL:
+            lines.append("")
+            for k in range(1, qty):
+                # targets at a quarter, half and three quarters of the kept range
+                targets = sorted({k + round(q * k * (sides - 1)) for q in (0.25, 0.5, 0.75)})
+                for tag, high in (("kh", True), ("kl", False)):
+                    odds = ", ".join(f"≥{t} {self._odds.keep_at_least(qty, sides, k, t, high):.1%}"
+                                     for t in targets)
+                    lines.append(self.tr("odds_keep", expr=f"{qty}{die}{tag}{k}", odds=odds,
+                                         mean=self._odds.keep_mean(qty, sides, k, high)))
+        messagebox.showinfo(self.tr("odds_title", die=die), "\n".join(lines))
+
+    def toggle_replay(self):
+        if self.replayer and self.replayer.running:
+            self.replayer.stop()
+            self.replayer = None
+            return
+        path = filedialog.askopenfilename(title=self.tr("replay_title"), initialdir=sessions_dir(),
+                                          filetypes=[(self.tr("replay"), f"*{SUFFIX}")])
+        if not path:
+            return
+        try:
+            self.replayer = Replayer(Path(path), self.root.after, self.root.after_cancel,
+                                     self._show_replayed, speed=float(self.speed_var.get()))
+            self.replayer.start()
+        except (OSError, ValueError) as e:
+            self.replayer = None
+            messagebox.showerror(self.tr("error"), self.tr("replay_error", error=e))
+
+    def _set_replay_speed(self, value: str):
+        if self.replayer:
+            self.replayer.speed = float(value)
+
+    def _show_replayed(self, rec: Record):
+        self._play_sound()
+        # dice no longer registered fall back to plain ones of the same size
+        keys = [k if isinstance(k, int) or k in self.DICE else s for k, s in zip(rec.keys, rec.sides)]
+        self._update_display(rec.results, keys, rec.mod, rec.total, label=rec.label, signs=rec.signs)
+
+    def _flush_history(self):
+        try:
+            self.roll_log.flush()
+        except OSError as e:
+            self._warn_once("no_log", self.tr("no_log", error=e))
+        try:
+            self.recorder.flush()
+        except OSError as e:
+            self._warn_once("no_record", self.tr("no_record", error=e))
+        self.root.after(int(FLUSH_SECONDS * 1000), self._flush_history)
+
+    def _setup_profiler(self, export_path: Path | None):
+        self.profiler = Profiler()
+        for name in ("roll", "roll_expression", "_update_display", "_play_sound", "_append_history"):
+            self.profiler.attach(self, name)
+        self.profiler.attach(self.frame_clock, "_tick", "frame")
+        self._timings_shown = False
+        self._timings_export = export_path
+        self.root.bind("<F12>", lambda _e: self.toggle_timings())
+        if export_path:
+            self.profiler.enable()
+            self.root.after(TIMINGS_EXPORT_MS, self._export_timings)
+
+    def toggle_timings(self):
+        self._timings_shown = not self._timings_shown
+        if self._timings_shown:
+            self.profiler.enable()
+            self.timings_label.pack(padx=10, pady=(0, 5), fill="x")
+            self._refresh_timings()
+        else:
+            self.timings_label.pack_forget()
+            if not self._timings_export:
+                self.profiler.disable()
+
+    def _refresh_timings(self):
+        if not self._timings_shown:
+            return
+        self.timings_label.config(text=self.profiler.format())
+        self.root.after(TIMINGS_REFRESH_MS, self._refresh_timings)
+
+    def _export_timings(self):
+        try:
+            self.profiler.export(self._timings_export)
+        except OSError as e:
+            self._warn_once("no_profile", self.tr("no_profile", error=e))
+            return
+        self.root.after(TIMINGS_EXPORT_MS, self._export_timings)
+
+    def _on_close(self):
+        self.sound.close()
+        if self.replayer:
+            self.replayer.stop()
+        if self._odds:
+            self._odds.close()
+        self.pipeline.close()
+        if self.server:
+            self.server.stop()
+        try:
+            self.roll_log.close()
+            self.recorder.close()
+        except OSError:
+            pass
+        self.root.destroy()
+
+def run(server: RollServer | None = None, roll_engine: engine.RollEngine | None = None,
+        profile: Path | None = None, locale: str = DEFAULT_LOCALE):
+    root = tk.Tk()
+    DiceRoller(root, server, roll_engine, profile, locale)
+    root.mainloop()
@@ -0,0 +1,221 @@
+"""Roll history: an append-only JSON-lines log plus a bounded display view.
+
+Every roll is appended to the log through a small write buffer that is
+flushed every ``FLUSH_EVERY`` entries or ``FLUSH_SECONDS`` seconds. On
+start-up only the tail of the log is read, by scanning blocks backwards
+from the end of the file. The in-memory ring and the Text widget both have
+a fixed size; older lines are paged back into the widget when the user
+scrolls to its top.
+"""
+from __future__ import annotations
+import json, os, time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from itertools import groupby, islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+FLUSH_EVERY = 64
+FLUSH_SECONDS = 2.0
+RING_SIZE = 5000
+VIEW_LINES = 300
+PAGE_LINES = 100
+_BLOCK = 1 << 16
+
+
+def data_dir() -> Path:
+    return Path(os.environ.get("DND_DICE_HOME") or Path.home() / ".dnd_dice_roller")
+
+
+def default_log_path() -> Path:
+    return data_dir() / "history.jsonl"
+
+
+@dataclass
+class Entry:
+    text: str
+    dice: List[Tuple[Union[int, str], List[int]]]  # (die key, faces) groups in roll order
+    mod: int = 0
+    total: int = 0
+    mode: str = "random"
+    t: float = field(default_factory=time.time)
+    rolled: Optional[List[Tuple[Union[int, str], List[int]]]] = None  # every die thrown, if not just ``dice``
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line: str) -> "Entry":
+        d = json.loads(line)
+        d["dice"] = [(s, v) for s, v in d["dice"]]
+        if d.get("rolled") is not None:
+            d["rolled"] = [(s, v) for s, v in d["rolled"]]
+        return cls(**d)
+
+    def pairs(self) -> Iterator[Tuple[int, int]]:
+        for sides, values in self.dice:
+            for v in values:
+                yield sides, v
+
+
+def group_dice(pairs: Iterable[Tuple[int, int]]) -> List[Tuple[int, List[int]]]:
+    return [(s, [v for _, v in g]) for s, g in groupby(pairs, key=lambda p: p[0])]
+
+
+class RollLog:
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or default_log_path())
+        self._buf: List[str] = []
+        self._last_flush = time.monotonic()
+        self._fh = None
+
+    def append(self, entry: Entry):
+        self._buf.append(entry.to_json() + "\n")
+        if len(self._buf) >= FLUSH_EVERY or time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buf:
+            return
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.writelines(self._buf)
+        self._fh.flush()
+        self._buf.clear()
+
+    def close(self):
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def tail_lines(path: Path, n: int) -> List[str]:
+    """Last ``n`` lines of ``path``, read backwards in blocks."""
+    try:
+        fh = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with fh:
+        pos = fh.seek(0, os.SEEK_END)
+        chunks, newlines = [], 0
+        while pos > 0 and newlines <= n:
+            step = min(_BLOCK, pos)
+            pos -= step
+            fh.seek(pos)
+            chunk = fh.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    lines = b"".join(reversed(chunks)).decode("utf-8", "replace").splitlines()
+    if pos > 0:
+        lines = lines[1:]  # first line may be cut in half
+    return lines[-n:] if n else []
+
+
+def read_tail(path: Path, n: int) -> List[Entry]:
+    out = []
+    for line in tail_lines(path, n):
+        try:
+            out.append(Entry.from_json(line))
+        except (ValueError, KeyError, TypeError):
+            continue  # torn write from a crash
+    return out
+
+
+def read_all(path: Path) -> Iterator[Entry]:
+    try:
+        fh = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with fh:
+        for line in fh:
+            try:
+                yield Entry.from_json(line)
+            except (ValueError, KeyError, TypeError):
+                continue
+
+
+class HistoryView:
+    """Shows a sliding window of the ring in a Text widget.
+
+    Lines ``[lo, hi)`` (absolute roll numbers) are in the widget. New lines
+    are only inserted while the view follows the end; otherwise they wait in
+    the ring until the user scrolls back down.
+    """
+
+    def __init__(self, text, ring_size: int = RING_SIZE, window: int = VIEW_LINES):
+        self.text = text
+        self.ring: deque = deque(maxlen=ring_size)
+        self.window = window
+        self.count = 0
+        self.lo = self.hi = 0
+        self.following = True
+        self._job = None
+        text.config(yscrollcommand=self._on_scroll)
+
+    @property
+    def first(self) -> int:
+        return self.count - len(self.ring)
+
+    def _lines(self, start: int, stop: int) -> str:
+        return "".join(f"{s}\n" for s in islice(self.ring, start - self.first, stop - self.first))
+
+    def _edit(self, fn):
+        self.text.config(state="normal")
+        fn()
+        self.text.config(state="disabled")
+
+    def extend(self, lines: Sequence[str]):
+        self.ring.extend(lines)
+        self.count += len(lines)
+        if self.following:
+            self._catch_up()
+
+    def append(self, line: str):
+        self.extend((line,))
+
+    def _catch_up(self):
+        lo = max(self.lo, self.first, self.count - self.window)
+        if lo >= self.hi:
+            def reset():
+                self.text.delete("1.0", "end")
+                self.text.insert("end", self._lines(lo, self.count))
+        else:
+            def reset():
+                self.text.insert("end", self._lines(self.hi, self.count))
+                if lo > self.lo:
+                    self.text.delete("1.0", f"{lo - self.lo + 1}.0")
+        self._edit(reset)
+        self.lo, self.hi = lo, self.count
+        self.text.see("end")
+
+    def _page_older(self):
+        lo = max(self.first, self.lo - PAGE_LINES)
+        if lo >= self.lo:
+            return
+        added = self.lo - lo
+        hi = min(self.hi, lo + self.window + PAGE_LINES)
+
+        def page():
+            if hi < self.hi:
+                shown = self.hi - self.lo
+                self.text.delete(f"{shown - (self.hi - hi) + 1}.0", f"{shown + 1}.0")
+            self.text.insert("1.0", self._lines(lo, self.lo))
+        self._edit(page)
+        self.lo, self.hi = lo, hi
+        self.text.yview(f"{added + 1}.0")
+
+    def _on_scroll(self, first, last):
+        first, last = float(first), float(last)
+        self.following = last >= 0.999
+        if self._job is None:
+            if first <= 0.0 and self.lo > self.first:
+                self._job = self.text.after_idle(self._settle, self._page_older)
+            elif last >= 0.999 and self.hi < self.count:
+                self._job = self.text.after_idle(self._settle, self._catch_up)
+
+    def _settle(self, fn):
+        self._job = None
+        fn()
@@ -0,0 +1,57 @@
+"""UI string catalogs, one JSON file per locale in ``locales/``.
+
+Only the active locale's file is parsed; English is loaded as a fallback
+only if a key is missing from it. Switching locale just swaps the catalog,
+so widgets bound to :class:`Translator` keys can be relabelled in place.
+"""
+from __future__ import annotations
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+LOCALE_DIR = Path(__file__).resolve().parent / "locales"
+DEFAULT_LOCALE = "en"
+
+
+def available() -> List[str]:
+    return sorted(p.stem for p in LOCALE_DIR.glob("*.json"))
+
+
+@lru_cache(maxsize=None)
+def catalog(locale: str) -> Dict[str, str]:
+    path = LOCALE_DIR / f"{locale}.json"
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise ValueError(f"Unknown locale {locale!r}; available: {', '.join(available())}") from None
+
+
+class Translator:
+    def __init__(self, locale: str = DEFAULT_LOCALE):
+        self.locale = locale
+        self._strings = catalog(locale)
+
+    def set_locale(self, locale: str):
+        self._strings = catalog(locale)
+        self.locale = locale
+
+    def __call__(self, key: str, **fmt) -> str:
+        text = self._strings.get(key)
+        if text is None:
+            text = catalog(DEFAULT_LOCALE).get(key, key)
+        return text.format(**fmt) if fmt else text
+
+
+class LocalizedError(ValueError):
+    """Error whose message is a catalog key, so each UI can show it in its own language.
+
+    ``str()`` gives the English text for logs and the headless CLI.
+    """
+
+    def __init__(self, key: str, **fmt):
+        self.key, self.fmt = key, fmt
+        super().__init__(Translator()(key, **fmt))
+
+    def text(self, tr: Translator) -> str:
+        return tr(self.key, **self.fmt)
@@ -0,0 +1,105 @@
+"""Opt-in timing of hot paths.
+
+Targets are registered with :meth:`Profiler.attach`. Nothing is wrapped
+until :meth:`Profiler.enable`, which shadows each method with a timed
+wrapper on the instance. :meth:`Profiler.disable` deletes the wrappers, so
+while profiling is off the code runs exactly as if it were not there.
+Durations are kept in a fixed-size ring per metric; percentiles are
+computed only when a snapshot is taken.
+"""
+from __future__ import annotations
+import json, time
+from collections import deque
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Tuple
+
+WINDOW = 1024  # samples per metric
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class Profiler:
+    def __init__(self, window: int = WINDOW, clock: Callable[[], float] = time.perf_counter):
+        self.window = window
+        self.clock = clock
+        self.enabled = False
+        self.samples: Dict[str, Deque[float]] = {}
+        self.counts: Dict[str, int] = {}
+        self._targets: List[Tuple[object, str, str]] = []
+
+    def attach(self, obj, attr: str, label: str = ""):
+        self._targets.append((obj, attr, label or attr.strip("_")))
+
+    def record(self, label: str, seconds: float):
+        ring = self.samples.get(label)
+        if ring is None:
+            ring = self.samples[label] = deque(maxlen=self.window)
+            self.counts[label] = 0
+        ring.append(seconds)
+        self.counts[label] += 1
+
+    def _wrap(self, fn, label: str):
+        clock, record = self.clock, self.record
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(label, clock() - t0)
+        return timed
+
+    def enable(self):
+        if self.enabled:
+            return
+        for obj, attr, label in self._targets:
+            setattr(obj, attr, self._wrap(getattr(obj, attr), label))
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for obj, attr, _ in self._targets:
+            try:
+                delattr(obj, attr)
+            except AttributeError:
+                pass
+        self.enabled = False
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Per metric: total calls and p50/p95/p99/max in milliseconds over the window."""
+        out = {}
+        for label, ring in self.samples.items():
+            values = sorted(ring)
+            out[label] = {
+                "count": self.counts[label],
+                "p50": round(percentile(values, 0.50) * 1e3, 3),
+                "p95": round(percentile(values, 0.95) * 1e3, 3),
+                "p99": round(percentile(values, 0.99) * 1e3, 3),
+                "max": round(values[-1] * 1e3, 3),
+            }
+        return out
+
+    def format(self) -> str:
+        snap = self.snapshot()
+        if not snap:
+            return "No timings yet."
+        rows = [f"{'ms':<16}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}{'n':>7}"]
+        for label in sorted(snap):
+            s = snap[label]
+            rows.append(f"{label:<16}{s['p50']:>8.2f}{s['p95']:>8.2f}{s['p99']:>8.2f}"
+                        f"{s['max']:>8.2f}{s['count']:>7}")
+        return "\n".join(rows)
+
+    def export(self, path: Path):
+        """Append one JSON line with the current snapshot."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"t": time.time(), "timings": self.snapshot()}) + "\n")
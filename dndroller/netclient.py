@@ -0,0 +1,59 @@
+"""Minimal roll-service client: ``python -m dndroller.netclient [HOST] [PORT]``.
+
+Prints each roll broadcast by :class:`~dndroller.server.RollServer`. It is a
+stand-in for a player device and a building block for load tests.
+"""
+from __future__ import annotations
+import argparse, asyncio, json, sys
+from typing import Awaitable, Callable, Optional
+
+from .protocol import DEFAULT_PORT
+
+
+async def listen(host: str, port: int, on_message: Callable[[dict], Optional[Awaitable]],
+                 count: Optional[int] = None):
+    """Call ``on_message`` for every roll; stop after ``count`` rolls if given."""
+    reader, writer = await asyncio.open_connection(host, port)
+    seen = 0
+    try:
+        while count is None or seen < count:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                print(f"dndroller.netclient: skipping malformed line: {line[:80]!r}", file=sys.stderr)
+                continue
+            if not isinstance(msg, dict) or msg.get("type") != "roll":
+                continue
+            seen += 1
+            res = on_message(msg)
+            if asyncio.iscoroutine(res):
+                await res
+    finally:
+        writer.close()
+
+
+def _print(msg: dict):
+    print(msg.get("text") or json.dumps(msg, ensure_ascii=False), flush=True)
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="dndroller.netclient", description=__doc__.splitlines()[0])
+    p.add_argument("host", nargs="?", default="127.0.0.1")
+    p.add_argument("port", nargs="?", type=int, default=DEFAULT_PORT)
+    p.add_argument("-n", "--count", type=int, help="exit after N rolls")
+    args = p.parse_args(argv)
+    try:
+        asyncio.run(listen(args.host, args.port, _print, args.count))
+    except (ConnectionError, OSError) as e:
+        print(f"dndroller.netclient: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
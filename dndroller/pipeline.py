@@ -0,0 +1,108 @@
+"""Staged roll pipeline: worker thread → result queue → coalesced UI apply.
+
+Jobs run in submission order on one worker thread, so the RNG and result
+formatting never block the Tk loop. The main thread polls the result queue
+only while jobs are outstanding, because Tk must not be called from the
+worker. Every result goes to ``on_result`` (history, stats, network). Only
+the newest one reaches ``on_latest`` (the board), from a single
+``after_idle`` callback, so bursts of rolls skip intermediate redraws.
+"""
+from __future__ import annotations
+import queue, threading
+from typing import Any, Callable, Optional
+
+POLL_MS = 10
+
+
+def _reraise(exc: BaseException):
+    raise exc
+
+
+class RollPipeline:
+    def __init__(self, after: Callable[[int, Callable[[], None]], Any],
+                 after_idle: Callable[[Callable[[], None]], Any],
+                 on_result: Callable[[Any], None], on_latest: Callable[[Any], None],
+                 on_error: Callable[[BaseException], None] = _reraise, poll_ms: int = POLL_MS):
+        self._after, self._after_idle = after, after_idle
+        self.on_result, self.on_latest, self.on_error = on_result, on_latest, on_error
+        self.poll_ms = poll_ms
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+        self._pending = 0
+        self._polling = False
+        self._latest: Any = None
+        self._render_job = None
+        self.completed = self.skipped_redraws = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, job: Callable[[], Any]):
+        """Queue ``job`` for the worker; call from the Tk thread only."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="roll-worker", daemon=True)
+            self._worker.start()
+        self._pending += 1
+        self._jobs.put(job)
+        if not self._polling:
+            self._polling = True
+            self._after(self.poll_ms, self._poll)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            try:
+                self._done.put((True, job()))
+            except BaseException as e:
+                self._done.put((False, e))
+
+    def _poll(self):
+        latest = fresh = None
+        try:
+            while True:
+                try:
+                    ok, value = self._done.get_nowait()
+                except queue.Empty:
+                    break
+                self._pending -= 1
+                if not ok:
+                    self.on_error(value)
+                    continue
+                self.completed += 1
+                try:
+                    self.on_result(value)
+                except Exception as e:
+                    self.on_error(e)
+                    continue
+                if fresh is not None:
+                    self.skipped_redraws += 1
+                fresh = latest = value
+        finally:
+            # a failing callback must not leave _polling stuck on
+            if latest is not None:
+                if self._latest is not None:
+                    self.skipped_redraws += 1
+                self._latest = latest
+                if self._render_job is None:
+                    self._render_job = self._after_idle(self._render)
+            if self._pending:
+                self._after(self.poll_ms, self._poll)
+            else:
+                self._polling = False
+
+    def _render(self):
+        self._render_job = None
+        latest, self._latest = self._latest, None
+        if latest is not None:
+            try:
+                self.on_latest(latest)
+            except Exception as e:
+                self.on_error(e)
+
+    def close(self):
+        if self._worker is not None:
+            self._jobs.put(None)
@@ -0,0 +1,179 @@
+"""Exact probability distributions for NdS±mod.
+
+The PMF of N dice is the N-th power of the single-die polynomial, computed by
+repeated squaring. Convolutions go through NumPy's FFT when it is installed.
+The pure-Python fallback packs both PMFs as fixed-point digits of two big
+integers and lets CPython's Karatsuba multiplication do the convolution.
+
+Results are cached by the total number of PMF points held, not by entry
+count, since one 500d100 weighs as much as a thousand 3d6.
+"""
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import accumulate
+from typing import NamedTuple, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CACHE_POINTS = 1_000_000  # PMF values kept across all cached distributions
+FFT_THRESHOLD = 500  # below this, direct convolution is faster than FFT
+PACK_THRESHOLD = 32  # pure Python: below this, the schoolbook loop is faster
+PACK_BITS = 64  # fixed-point fraction bits per packed probability
+
+
+@dataclass(frozen=True)
+class Distribution:
+    lo: int
+    pmf: Tuple[float, ...]
+
+    @property
+    def hi(self) -> int:
+        return self.lo + len(self.pmf) - 1
+
+    @cached_property
+    def _cum(self) -> Tuple[float, ...]:
+        return tuple(accumulate(self.pmf))
+
+    def p(self, x: int) -> float:
+        return self.pmf[x - self.lo] if self.lo <= x <= self.hi else 0.0
+
+    def cdf(self, x: int) -> float:
+        """P(X ≤ x)."""
+        if x < self.lo:
+            return 0.0
+        if x >= self.hi:
+            return 1.0
+        return min(1.0, self._cum[x - self.lo])
+
+    def at_least(self, x: int) -> float:
+        """P(X ≥ x), e.g. the chance to meet a DC."""
+        return max(0.0, 1.0 - self.cdf(x - 1))
+
+    @cached_property
+    def mean(self) -> float:
+        return sum((self.lo + i) * p for i, p in enumerate(self.pmf))
+
+    @cached_property
+    def variance(self) -> float:
+        m = self.mean
+        return sum((self.lo + i - m) ** 2 * p for i, p in enumerate(self.pmf))
+
+    def shift(self, mod: int) -> "Distribution":
+        return Distribution(self.lo + mod, self.pmf) if mod else self
+
+    def __add__(self, other: "Distribution") -> "Distribution":
+        return Distribution(self.lo + other.lo, tuple(_convolve(self.pmf, other.pmf)))
+
+
+def _clean(values) -> list:
+    # FFT round-off leaves tiny negatives in the far tails
+    out = np.clip(values, 0.0, None)
+    return (out / out.sum()).tolist()
+
+
+def _convolve(a: Sequence[float], b: Sequence[float]) -> list:
+    if np is not None:
+        if min(len(a), len(b)) < FFT_THRESHOLD:
+            return _clean(np.convolve(a, b))
+        n = len(a) + len(b) - 1
+        size = 1 << (n - 1).bit_length()
+        fa = np.fft.rfft(a, size)
+        fb = fa if b is a else np.fft.rfft(b, size)
+        return _clean(np.fft.irfft(fa * fb, size)[:n])
+    if min(len(a), len(b)) >= PACK_THRESHOLD:
+        return _packed_convolve(a, b)
+    out = [0.0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                out[i + j] += x * y
+    return out
+
+
+def _packed_convolve(a: Sequence[float], b: Sequence[float]) -> list:
+    # Kronecker substitution: each value becomes a PACK_BITS fixed-point digit,
+    # wide enough that the digits of the product never carry into each other
+    n = len(a) + len(b) - 1
+    width = (2 * PACK_BITS + n.bit_length() + 7) // 8
+    scale = float(1 << PACK_BITS)
+
+    def pack(values) -> int:
+        return int.from_bytes(b"".join(int(x * scale).to_bytes(width, "little") for x in values), "little")
+
+    pa = pack(a)
+    raw = (pa * (pa if b is a else pack(b))).to_bytes(n * width, "little")
+    unit = 1.0 / (1 << 2 * PACK_BITS)
+    return [int.from_bytes(raw[i:i + width], "little") * unit for i in range(0, n * width, width)]
+
+
+def _power(qty: int, sides: int) -> list:
+    result, base = [1.0], [1.0 / sides] * sides
+    while qty:
+        if qty & 1:
+            result = _convolve(result, base)
+        qty >>= 1
+        if qty:
+            base = _convolve(base, base)
+    return result
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    points: int
+
+
+_cache: "OrderedDict[Tuple[int, int], Distribution]" = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "points": 0}
+
+
+def _dice(qty: int, sides: int) -> Distribution:
+    key = (qty, sides)
+    with _cache_lock:
+        dist = _cache.get(key)
+        if dist is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return dist
+        _stats["misses"] += 1
+    dist = Distribution(qty, tuple(_power(qty, sides)))
+    if len(dist.pmf) > CACHE_POINTS:
+        return dist
+    with _cache_lock:
+        if key not in _cache:
+            _cache[key] = dist
+            _stats["points"] += len(dist.pmf)
+        while _stats["points"] > CACHE_POINTS:
+            _, old = _cache.popitem(last=False)
+            _stats["points"] -= len(old.pmf)
+    return dist
+
+
+def distribution(qty: int, sides: int, mod: int = 0) -> Distribution:
+    """Exact distribution of ``qty`` dice with ``sides`` faces plus ``mod``."""
+    if qty < 0 or sides < 1:
+        raise ValueError("Quantity must be ≥ 0 and sides ≥ 1.")
+    return _dice(qty, sides).shift(mod)
+
+
+def chance_at_least(qty: int, sides: int, mod: int, dc: int) -> float:
+    return distribution(qty, sides, mod).at_least(dc)
+
+
+def cache_info() -> CacheInfo:
+    with _cache_lock:
+        return CacheInfo(_stats["hits"], _stats["misses"], len(_cache), _stats["points"])
+
+
+def cache_clear():
+    with _cache_lock:
+        _cache.clear()
+        _stats.update(hits=0, misses=0, points=0)
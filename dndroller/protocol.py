@@ -0,0 +1,6 @@
+"""Roll service constants, kept apart from :mod:`~dndroller.server` so that
+importing them (the CLI does, for its help text) does not pull in asyncio.
+"""
+
+DEFAULT_PORT = 8765
+PROTOCOL = 1
@@ -0,0 +1,294 @@
+"""Session recording in a compact binary format, with replay and export.
+
+    python -m dndroller.replay list
+    python -m dndroller.replay export SESSION -f csv -o session.csv
+
+Each GUI session writes ``<data dir>/sessions/<start time>.dnds``: a header
+followed by one packed record per roll (little-endian)::
+
+    f64 time | i64 total | i64 modifier | u8 mode | u16 groups | u16 label bytes
+    label (UTF-8)
+    groups × (u32 sides | u32 count | u8 flags | u8 name bytes | name | count values)
+
+Plain ``dN`` groups have an empty name; registered dice (weighted, Fudge,
+labelled) carry their registry name so they replay and export as
+themselves. Flag bit 0 marks a subtracted group, as in ``1d20 - 1d4``.
+
+Values are stored as u8, u16 or u32 depending on the die, so a d20 costs
+one byte per die. Readers stream one record at a time, so replay and
+export work on sessions of any length in constant memory. A record torn by
+a crash ends the stream instead of raising.
+"""
+from __future__ import annotations
+import argparse, csv, json, struct, sys, time
+from array import array
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from .dice import REGISTRY, Key
+from .history import FLUSH_EVERY, FLUSH_SECONDS, Entry, data_dir
+
+VERSION = 1
+MAGIC = b"DNDS"
+SUFFIX = ".dnds"
+MODES = ("random", "force")
+MAX_GAP = 3.0  # seconds; longer pauses are shortened on replay
+FORMATS = ("csv", "json", "jsonl")
+_HEADER = struct.Struct("<4sH")
+_REC = struct.Struct("<dqqBHH")
+_GROUP = struct.Struct("<IIBB")
+NEGATIVE = 1  # group flag
+
+
+def sessions_dir() -> Path:
+    return data_dir() / "sessions"
+
+
+def new_session_path() -> Path:
+    return sessions_dir() / f"{datetime.now():%Y%m%d-%H%M%S}{SUFFIX}"
+
+
+def _typecode(sides: int) -> str:
+    return "B" if sides < 1 << 8 else "H" if sides < 1 << 16 else "I"
+
+
+class Record(NamedTuple):
+    t: float
+    label: str
+    mode: str
+    mod: int
+    total: int
+    dice: List[Tuple[Key, List[int]]]
+    group_sides: List[int]
+    group_signs: List[int]
+
+    @property
+    def results(self) -> List[int]:
+        return [v for _, values in self.dice for v in values]
+
+    @property
+    def keys(self) -> List[Key]:
+        return [k for k, values in self.dice for _ in values]
+
+    @property
+    def sides(self) -> List[int]:
+        return [s for s, (_, values) in zip(self.group_sides, self.dice) for _ in values]
+
+    @property
+    def signs(self) -> List[int]:
+        return [s for s, (_, values) in zip(self.group_signs, self.dice) for _ in values]
+
+    def to_dict(self) -> dict:
+        return {"t": self.t, "label": self.label, "mode": self.mode, "mod": self.mod,
+                "total": self.total, "dice": self.dice, "signs": self.group_signs}
+
+
+def _signed_groups(entry: Entry, signs: Optional[List[int]]) -> List[Tuple[Key, int, List[int]]]:
+    """Split ``entry.dice`` where the per-die ``signs`` change."""
+    it = iter(signs or ())
+    return [(key, sign, [v for _, v in run])
+            for key, values in entry.dice
+            for sign, run in groupby([(-1 if next(it, 1) < 0 else 1, v) for v in values],
+                                     key=lambda p: p[0])]
+
+
+def pack(entry: Entry, label: str, signs: Optional[List[int]] = None) -> bytes:
+    """``signs`` has one entry per die, as in ``entry.dice`` order.
+
+    Raises ``ValueError`` for a roll that does not fit the format.
+    """
+    lab = label.encode("utf-8")[:0xFFFF]
+    groups = _signed_groups(entry, signs)
+    try:
+        parts = [_REC.pack(entry.t, entry.total, entry.mod, MODES.index(entry.mode),
+                           len(groups), len(lab)), lab]
+        for key, sign, values in groups:
+            sides = key if isinstance(key, int) else REGISTRY.spec(key).sides
+            name = b"" if isinstance(key, int) else key.encode("utf-8")[:0xFF]
+            arr = array(_typecode(sides), values)
+            if sys.byteorder == "big":
+                arr.byteswap()
+            flags = NEGATIVE if sign < 0 else 0
+            parts += [_GROUP.pack(sides, len(values), flags, len(name)), name, arr.tobytes()]
+    except (struct.error, OverflowError, KeyError) as e:
+        raise ValueError(f"Roll cannot be recorded: {e}") from None
+    return b"".join(parts)
+
+
+class SessionRecorder:
+    """Buffered appender, flushed on the same schedule as the JSON log."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or new_session_path())
+        self._buf = bytearray()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._fh: Optional[BinaryIO] = None
+
+    def append(self, entry: Entry, label: str, signs: Optional[List[int]] = None):
+        self._buf += pack(entry, label, signs)
+        self._pending += 1
+        if self._pending >= FLUSH_EVERY or time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buf:
+            return
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "ab")
+            if self._fh.tell() == 0:
+                self._fh.write(_HEADER.pack(MAGIC, VERSION))
+        self._fh.write(self._buf)
+        self._fh.flush()
+        self._buf.clear()
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def read_session(path: Path) -> Iterator[Record]:
+    """Opens and checks ``path`` now; records are read as they are iterated."""
+    fh = open(path, "rb")
+    head = fh.read(_HEADER.size)
+    if len(head) < _HEADER.size or _HEADER.unpack(head) != (MAGIC, VERSION):
+        fh.close()
+        raise ValueError(f"{path} is not a version {VERSION} session file")
+    return _records(fh)
+
+
+def _records(fh: BinaryIO) -> Iterator[Record]:
+    with fh:
+        while True:
+            raw = fh.read(_REC.size)
+            if len(raw) < _REC.size:
+                return
+            t, total, mod, mode, groups, lab_len = _REC.unpack(raw)
+            label = fh.read(lab_len)
+            dice, group_sides, group_signs = [], [], []
+            for _ in range(groups):
+                raw = fh.read(_GROUP.size)
+                if len(raw) < _GROUP.size:
+                    return
+                sides, count, flags, name_len = _GROUP.unpack(raw)
+                name = fh.read(name_len)
+                if len(name) < name_len:
+                    return
+                arr = array(_typecode(sides))
+                data = fh.read(count * arr.itemsize)
+                if len(data) < count * arr.itemsize:
+                    return
+                arr.frombytes(data)
+                if sys.byteorder == "big":
+                    arr.byteswap()
+                dice.append((name.decode("utf-8", "replace") if name else sides, arr.tolist()))
+                group_sides.append(sides)
+                group_signs.append(-1 if flags & NEGATIVE else 1)
+            if len(label) < lab_len or mode >= len(MODES):
+                return
+            yield Record(t, label.decode("utf-8", "replace"), MODES[mode], mod, total, dice,
+                         group_sides, group_signs)
+
+
+def export(path: Path, out: TextIO, fmt: str = "csv") -> int:
+    """Stream every record of ``path`` to ``out``; returns the record count."""
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}")
+    n, records = 0, read_session(path)
+    if fmt == "csv":
+        w = csv.writer(out)
+        w.writerow(["time", "label", "mode", "modifier", "total", "dice"])
+        for n, r in enumerate(records, 1):
+            dice = "; ".join(f"{'-' if s < 0 else ''}{f'd{k}' if isinstance(k, int) else k}:"
+                             f"{','.join(map(str, v))}" for s, (k, v) in zip(r.group_signs, r.dice))
+            w.writerow([datetime.fromtimestamp(r.t).isoformat(timespec="milliseconds"),
+                        r.label, r.mode, r.mod, r.total, dice])
+    elif fmt == "json":
+        out.write("[")
+        for n, r in enumerate(records, 1):
+            out.write(("\n" if n == 1 else ",\n") + json.dumps(r.to_dict(), ensure_ascii=False))
+        out.write("\n]\n")
+    else:
+        for n, r in enumerate(records, 1):
+            out.write(json.dumps(r.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+    return n
+
+
+class Replayer:
+    """Feeds a recorded session to ``on_record`` through Tk's ``after``.
+
+    Gaps between rolls follow the recording, divided by ``speed`` and capped
+    at ``max_gap``; ``speed`` may be changed while the replay runs.
+    """
+
+    def __init__(self, path: Path, after, after_cancel, on_record: Callable[[Record], None],
+                 speed: float = 1.0, max_gap: float = MAX_GAP,
+                 on_done: Optional[Callable[[], None]] = None):
+        self._records = read_session(path)
+        self._after, self._after_cancel = after, after_cancel
+        self.on_record, self.on_done = on_record, on_done
+        self.speed, self.max_gap = speed, max_gap
+        self._next: Optional[Record] = None
+        self._job = None
+
+    @property
+    def running(self) -> bool:
+        return self._job is not None
+
+    def start(self):
+        self._next = next(self._records, None)
+        self._job = self._after(0, self._step)
+
+    def _step(self):
+        rec, self._next = self._next, next(self._records, None)
+        if rec is None:
+            self._job = None
+            if self.on_done:
+                self.on_done()
+            return
+        self.on_record(rec)
+        gap = 0.0 if self._next is None else min(max(self._next.t - rec.t, 0.0), self.max_gap)
+        self._job = self._after(int(gap * 1000 / self.speed), self._step)
+
+    def stop(self):
+        if self._job is not None:
+            self._after_cancel(self._job)
+            self._job = None
+        self._records.close()
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="dndroller.replay", description="List and export recorded sessions.")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="list recorded sessions")
+    ex = sub.add_parser("export", help="export a session to CSV or JSON")
+    ex.add_argument("session", type=Path)
+    ex.add_argument("-f", "--format", choices=FORMATS, default="csv")
+    ex.add_argument("-o", "--output", type=Path, help="output file (default: stdout)")
+    args = p.parse_args(argv)
+    if args.cmd == "list":
+        for path in sorted(sessions_dir().glob(f"*{SUFFIX}")):
+            print(f"{path}  {path.stat().st_size} bytes")
+        return 0
+    try:
+        if args.output:
+            with open(args.output, "w", encoding="utf-8", newline="") as out:
+                n = export(args.session, out, args.format)
+        else:
+            n = export(args.session, sys.stdout, args.format)
+    except (OSError, ValueError) as e:
+        print(f"dndroller.replay: {e}", file=sys.stderr)
+        return 1
+    print(f"{n} rolls exported", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""One frame clock for every animated die.
+
+Steps are registered with :meth:`FrameClock.add` and called once per tick
+with the current time; a step returns ``False`` when its animation is done.
+The clock keeps a single ``after`` callback pending, and only while there
+is work to do. :meth:`FrameClock.clear` drops every step, which is used
+when a new roll replaces the board.
+"""
+from __future__ import annotations
+import time
+from itertools import count
+from typing import Callable, Dict, Optional
+
+Step = Callable[[float], bool]
+
+
+def _ema(old: float, new: float, alpha: float = 0.1) -> float:
+    return new if not old else old + (new - old) * alpha
+
+
+class FrameClock:
+    def __init__(self, after: Callable[[int, Callable[[], None]], str],
+                 after_cancel: Callable[[str], None], interval_ms: int = 20,
+                 clock: Callable[[], float] = time.perf_counter):
+        self._after, self._after_cancel = after, after_cancel
+        self.interval_ms = interval_ms
+        self._clock = clock
+        self._steps: Dict[int, Step] = {}
+        self._ids = count()
+        self._pending: Optional[str] = None
+        self._last_tick: Optional[float] = None
+        self.frames = 0
+        self.frame_ms = 0.0       # smoothed time spent inside a tick
+        self.max_frame_ms = 0.0
+        self.period_ms = 0.0      # smoothed time between ticks
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def add(self, step: Step) -> int:
+        handle = next(self._ids)
+        self._steps[handle] = step
+        if self._pending is None:
+            self._last_tick = None
+            self._pending = self._after(0, self._tick)
+        return handle
+
+    def remove(self, handle: int):
+        self._steps.pop(handle, None)
+
+    def clear(self):
+        self._steps.clear()
+        if self._pending is not None:
+            self._after_cancel(self._pending)
+            self._pending = None
+
+    def _tick(self):
+        self._pending = None
+        now = self._clock()
+        for handle, step in list(self._steps.items()):
+            if not step(now):
+                self._steps.pop(handle, None)
+        done = self._clock()
+        work = (done - now) * 1e3
+        self.frames += 1
+        self.frame_ms = _ema(self.frame_ms, work)
+        self.max_frame_ms = max(self.max_frame_ms, work)
+        if self._last_tick is not None:
+            self.period_ms = _ema(self.period_ms, (now - self._last_tick) * 1e3)
+        self._last_tick = now
+        if self._steps:
+            self._pending = self._after(max(1, int(self.interval_ms - work)), self._tick)
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._steps),
+            "frames": self.frames,
+            "frame_ms": round(self.frame_ms, 3),
+            "max_frame_ms": round(self.max_frame_ms, 3),
+            "period_ms": round(self.period_ms, 3),
+            "fps": round(1e3 / self.period_ms, 1) if self.period_ms else 0.0,
+        }
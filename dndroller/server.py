@@ -0,0 +1,131 @@
+"""Broadcast rolls to player devices over the local network.
+
+Plain TCP with one JSON object per line, so any device can follow along
+with ``nc`` or the bundled ``python -m dndroller.netclient``. The asyncio
+loop runs in one background thread for all clients. ``publish`` only hands
+the message to that loop, so the Tk thread never waits on the network.
+Every client has a bounded queue. A client that cannot keep up loses its
+oldest pending messages rather than slowing everyone else down.
+"""
+from __future__ import annotations
+import asyncio, json, threading
+from typing import Optional, Set
+
+from .protocol import DEFAULT_PORT, PROTOCOL
+
+QUEUE_SIZE = 256
+
+
+class RollServer:
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT,
+                 queue_size: int = QUEUE_SIZE):
+        self.host, self.port = host, port
+        self.queue_size = queue_size
+        self.sent = self.dropped = 0
+        self._clients: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    async def serve(self):
+        """Start listening on the running loop; ``self.port`` is the bound port."""
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def start(self) -> "RollServer":
+        """Run the server in a daemon thread and return once it is listening."""
+        ready = threading.Event()
+        failure: list = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self.serve())
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                ready.set()
+            if failure:
+                loop.close()
+                return
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="roll-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            raise failure[0]
+        return self
+
+    def stop(self):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        async def shutdown():
+            self._server.close()
+            for q in list(self._clients):
+                if q.full():
+                    q.get_nowait()
+                q.put_nowait(None)
+            await asyncio.sleep(0.05)
+            loop.stop()
+
+        if self._thread is not None:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop)
+            self._thread.join(timeout=2)
+        else:
+            self._server.close()
+
+    def publish(self, message: dict):
+        """Thread-safe; encoding and fan-out happen on the server loop."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._broadcast, message)
+
+    def _broadcast(self, message: dict):
+        if not self._clients:
+            return
+        line = (json.dumps(message, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+        for q in self._clients:
+            if q.full():
+                q.get_nowait()
+                self.dropped += 1
+            q.put_nowait(line)
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        q.put_nowait((json.dumps({"type": "hello", "protocol": PROTOCOL}) + "\n").encode())
+        self._clients.add(q)
+        sender = asyncio.create_task(self._send(q, writer))
+        try:
+            while await reader.read(1024):
+                pass  # clients only listen; reading just notices disconnects
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(q)
+            sender.cancel()
+            writer.close()
+
+    async def _send(self, q: asyncio.Queue, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                batch = [await q.get()]
+                while not q.empty():
+                    batch.append(q.get_nowait())
+                if None in batch:
+                    break
+                writer.writelines(batch)
+                await writer.drain()
+                self.sent += len(batch)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,170 @@
+"""Monte Carlo encounter simulation across a process pool.
+
+    python -m dndroller.simulate --bonus 5 --ac 15 --damage "1d8+3" -n 1000000
+
+Trials are split into fixed-size chunks. Chunk ``i`` draws from stream ``i``
+of a counter-based generator keyed by the seed, so results depend only on
+the seed, never on the number of workers. Chunk summaries are damage
+histograms, which merge exactly.
+"""
+from __future__ import annotations
+import argparse, math, os, sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from . import expr
+from .engine import RollEngine
+from .rng import CounterBackend
+
+CHUNK = 50_000
+MODES = ("normal", "advantage", "disadvantage")
+
+
+@dataclass(frozen=True)
+class AttackScenario:
+    attack_bonus: int
+    target_ac: int
+    damage: str = "1d8"
+    crit_range: int = 20  # natural d20 at or above this is a critical hit
+    mode: str = "normal"
+
+    def __post_init__(self):
+        if self.mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if not 2 <= self.crit_range <= 20:
+            raise ValueError("crit range must be 2..20 (a natural 1 always misses)")
+        expr.compile(self.damage)  # fail early, in the parent process
+
+
+@dataclass
+class Summary:
+    trials: int = 0
+    hits: int = 0
+    crits: int = 0
+    damage: Counter = field(default_factory=Counter)  # damage per trial -> count
+
+    def merge(self, other: "Summary") -> "Summary":
+        self.trials += other.trials
+        self.hits += other.hits
+        self.crits += other.crits
+        self.damage.update(other.damage)
+        return self
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.trials if self.trials else 0.0
+
+    @property
+    def crit_rate(self) -> float:
+        return self.crits / self.trials if self.trials else 0.0
+
+    @property
+    def mean_damage(self) -> float:
+        return sum(d * c for d, c in self.damage.items()) / self.trials if self.trials else 0.0
+
+    @property
+    def stdev_damage(self) -> float:
+        if self.trials < 2:
+            return 0.0
+        m = self.mean_damage
+        return math.sqrt(sum(c * (d - m) ** 2 for d, c in self.damage.items()) / (self.trials - 1))
+
+    def percentile(self, q: float) -> int:
+        rank, seen = q * (self.trials - 1), 0
+        for d in sorted(self.damage):
+            seen += self.damage[d]
+            if seen > rank:
+                return d
+        return 0
+
+    def __str__(self) -> str:
+        return (f"{self.trials:,} trials: hit {self.hit_rate:.2%}, crit {self.crit_rate:.2%}; "
+                f"damage per attack mean {self.mean_damage:.3f} ± {self.stdev_damage:.3f}, "
+                f"median {self.percentile(.5)}, p95 {self.percentile(.95)}, "
+                f"max {max(self.damage, default=0)}")
+
+
+def _term_sums(term: expr.DiceTerm, counts: List[int], eng: RollEngine) -> List[int]:
+    """Sum of ``term`` rolled once per entry, with ``counts[i]`` times its dice."""
+    if term.keep or term.explode or term.reroll or term.die:
+        # a crit rolls the whole term again: 2d20kh1 becomes two 2d20kh1, not 4d20kh1
+        return [sum(term.roll(eng).total for _ in range(k)) for k in counts]
+    values = eng.roll(term.qty * sum(counts), term.sides)
+    out, pos = [], 0
+    for k in counts:
+        n = term.qty * k
+        out.append(term.sign * sum(values[pos:pos + n]))
+        pos += n
+    return out
+
+
+def run_chunk(job: Tuple[AttackScenario, int, int, int]) -> Summary:
+    sc, trials, seed, index = job
+    eng = RollEngine(CounterBackend(seed, stream=index).randbytes)
+    plan = expr.compile(sc.damage)
+    d20 = eng.roll(trials * (1 if sc.mode == "normal" else 2), 20)
+    if sc.mode != "normal":
+        pick = max if sc.mode == "advantage" else min
+        d20 = [pick(a, b) for a, b in zip(d20[::2], d20[1::2])]
+    crit_at, need = sc.crit_range, sc.target_ac - sc.attack_bonus
+    mult = [0 if d == 1 else 2 if d >= crit_at else 1 if d >= need else 0 for d in d20]
+    dice_mult = [m for m in mult if m]
+    totals = [plan.constant] * len(dice_mult)
+    for term in plan.terms:
+        totals = [a + b for a, b in zip(totals, _term_sums(term, dice_mult, eng))]
+    out = Summary(trials, len(dice_mult), sum(1 for m in dice_mult if m == 2))
+    out.damage = Counter(max(0, t) for t in totals)
+    out.damage[0] += trials - len(dice_mult)
+    return out
+
+
+def simulate(scenario: AttackScenario, trials: int, seed: Optional[int] = None,
+             workers: Optional[int] = None, chunk: int = CHUNK) -> Summary:
+    """Run ``trials`` attacks; the same ``seed`` always gives the same summary."""
+    if trials < 1:
+        raise ValueError("trials must be at least 1")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    if seed is None:
+        seed = int.from_bytes(os.urandom(8), "little")
+    jobs = [(scenario, min(chunk, trials - start), seed, i)
+            for i, start in enumerate(range(0, trials, chunk))]
+    total = Summary()
+    if not jobs:
+        return total
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        for job in jobs:
+            total.merge(run_chunk(job))
+        return total
+    with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+        for part in pool.map(run_chunk, jobs):
+            total.merge(part)
+    return total
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="dndroller.simulate", description="Simulate attack rolls vs AC.")
+    p.add_argument("--bonus", type=int, required=True, help="attack bonus")
+    p.add_argument("--ac", type=int, required=True, help="target armour class")
+    p.add_argument("--damage", default="1d8", help="damage expression, dice doubled on a crit")
+    p.add_argument("--crit", type=int, default=20, help="lowest natural roll that crits")
+    p.add_argument("--mode", choices=MODES, default="normal")
+    p.add_argument("-n", "--trials", type=int, default=100_000)
+    p.add_argument("--seed", type=int)
+    p.add_argument("-j", "--workers", type=int, help="processes (default: all cores)")
+    args = p.parse_args(argv)
+    try:
+        sc = AttackScenario(args.bonus, args.ac, args.damage, args.crit, args.mode)
+        summary = simulate(sc, args.trials, args.seed, args.workers)
+    except ValueError as e:
+        print(f"dndroller.simulate: {e}", file=sys.stderr)
+        return 2
+    print(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""Precomputed die sprite geometry.
+
+Animation frames only rotate a polygon through a fixed set of angles, so the
+vertex lists are computed once per (vertices, size, angle index) and reused.
+The cache is an LRU so repeated window resizes cannot grow it without bound.
+"""
+from __future__ import annotations
+import math
+from functools import lru_cache
+from typing import List, Tuple
+
+ANGLE_STEPS = 20  # frame i is rotated by i * 2π / ANGLE_STEPS
+CACHE_SIZE = 2048
+
+
+def regular_polygon(n: int, size: int = 50, angle: float = 0) -> List[Tuple[float, float]]:
+    cx = cy = size / 2
+    r = size / 2 * 0.85
+    rot = -math.pi / 2 + (math.pi / 4 if n == 4 else 0) + angle
+    return [(cx + r * math.cos(2 * math.pi * i / n + rot),
+             cy + r * math.sin(2 * math.pi * i / n + rot)) for i in range(n)]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def polygon_coords(n: int, size: int, angle_idx: int = 0) -> Tuple[float, ...]:
+    """Flat ``x0, y0, x1, y1, ...`` tuple, ready for ``canvas.coords``."""
+    angle = 2 * math.pi * (angle_idx % ANGLE_STEPS) / ANGLE_STEPS
+    return tuple(c for xy in regular_polygon(n, size, angle) for c in xy)
+
+
+@lru_cache(maxsize=256)
+def value_font(size: int) -> Tuple[str, int, str]:
+    return ("Helvetica", int(size * 0.12), "bold")
+
+
+cache_info = polygon_coords.cache_info
+cache_clear = polygon_coords.cache_clear
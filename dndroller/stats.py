@@ -0,0 +1,182 @@
+"""Incremental roll statistics.
+
+Aggregates are updated as rolls arrive: face counts, exact integer sums for
+mean and variance, and runs of minimum/maximum faces (nat 1 / nat 20 on a
+d20). Every query costs O(1) or O(faces). ``chi_square`` tests the face
+counts against the uniform distribution that ``SystemRandom`` should give.
+Dice are keyed as in :mod:`~dndroller.dice`; weighted dice are tracked but
+never tested, and dice no longer in the registry are skipped.
+"""
+from __future__ import annotations
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .dice import REGISTRY, DiceRegistry, Key
+from .history import Entry, default_log_path, read_all
+from .i18n import Translator
+
+SIGNIFICANCE = 0.01
+
+
+def _gammaincc(a: float, x: float) -> float:
+    """Regularised upper incomplete gamma Q(a, x)."""
+    if x <= 0:
+        return 1.0
+    lg = math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        n = a
+        for _ in range(1000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(-x + a * math.log(x) - lg))
+    # Lentz continued fraction
+    tiny = 1e-300
+    b = x + 1 - a
+    c, d = 1 / tiny, 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, math.exp(-x + a * math.log(x) - lg) * h)
+
+
+@dataclass
+class Streak:
+    current: int = 0
+    best: int = 0
+
+    def push(self, hit: bool):
+        self.current = self.current + 1 if hit else 0
+        self.best = max(self.best, self.current)
+
+
+@dataclass
+class DieStats:
+    sides: int
+    weighted: bool = False
+    counts: List[int] = field(default_factory=list)
+    n: int = 0
+    total: int = 0
+    total_sq: int = 0
+    lows: Streak = field(default_factory=Streak)
+    highs: Streak = field(default_factory=Streak)
+
+    def __post_init__(self):
+        self.counts = self.counts or [0] * self.sides
+
+    def add(self, values: Iterable[int]):
+        counts, lows, highs, top = self.counts, self.lows, self.highs, self.sides
+        n = total = total_sq = 0
+        for v in values:
+            counts[v - 1] += 1
+            n += 1
+            total += v
+            total_sq += v * v
+            lows.push(v == 1)
+            highs.push(v == top)
+        self.n += n
+        self.total += total
+        self.total_sq += total_sq
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.n if self.n else 0.0
+
+    @property
+    def variance(self) -> float:
+        if self.n < 2:
+            return 0.0
+        return (self.total_sq - self.total * self.total / self.n) / (self.n - 1)
+
+    @property
+    def expected_mean(self) -> float:
+        return (self.sides + 1) / 2
+
+    def chi_square(self) -> Tuple[float, float]:
+        """``(statistic, p_value)`` against a fair die; p is 1.0 with no data."""
+        if not self.n:
+            return 0.0, 1.0
+        e = self.n / self.sides
+        stat = sum((c - e) ** 2 for c in self.counts) / e
+        return stat, _gammaincc((self.sides - 1) / 2, stat / 2)
+
+    def suspicious(self, alpha: float = SIGNIFICANCE) -> bool:
+        # below ~5 expected hits per face the chi-square approximation is poor
+        return not self.weighted and self.n >= 5 * self.sides and self.chi_square()[1] < alpha
+
+
+class SessionStats:
+    def __init__(self, include_forced: bool = False, registry: DiceRegistry = REGISTRY):
+        self.include_forced = include_forced
+        self.registry = registry
+        self.dice: Dict[Key, DieStats] = {}
+        self.rolls = 0
+
+    def die(self, key: Key) -> Optional[DieStats]:
+        st = self.dice.get(key)
+        if st is None:
+            if isinstance(key, int):
+                st = DieStats(key)
+            elif key in self.registry:
+                spec = self.registry.spec(key)
+                st = DieStats(spec.sides, spec.weights is not None)
+            else:
+                return None
+            self.dice[key] = st
+        return st
+
+    def add(self, entry: Entry):
+        if entry.mode != "random" and not self.include_forced:
+            return
+        self.rolls += 1
+        # dropped dice count too: judging only the kept ones would bias the test
+        for key, values in entry.rolled if entry.rolled is not None else entry.dice:
+            st = self.die(key)
+            if st is not None:
+                st.add(values)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Entry], include_forced: bool = False) -> "SessionStats":
+        st = cls(include_forced)
+        for e in entries:
+            st.add(e)
+        return st
+
+    @classmethod
+    def from_log(cls, path: Path, include_forced: bool = False) -> "SessionStats":
+        return cls.from_entries(read_all(path), include_forced)
+
+    def report(self, alpha: float = SIGNIFICANCE, tr: Optional[Translator] = None) -> str:
+        tr = tr or Translator()
+        if not self.dice:
+            return tr("stats_none")
+        lines = [tr("stats_rolls", n=self.rolls)]
+        for key in sorted(self.dice, key=lambda k: (isinstance(k, str), k)):
+            st = self.dice[key]
+            stat, p = st.chi_square()
+            verdict = "verdict_weighted" if st.weighted else "verdict_suspicious" if st.suspicious(alpha) \
+                else "verdict_fair" if st.n >= 5 * st.sides else "verdict_few"
+            lines.append(tr("stats_line", die=f"d{key}" if isinstance(key, int) else key, n=st.n,
+                            mean=st.mean, expect=st.expected_mean, sd=math.sqrt(st.variance),
+                            chi=stat, p=p, verdict=tr(verdict), lows=st.lows.best,
+                            sides=st.sides, highs=st.highs.best))
+        return "\n".join(lines)
+
+
+def rebuild(path: Optional[Path] = None) -> SessionStats:
+    return SessionStats.from_log(path or default_log_path())
@@ -0,0 +1,180 @@
+"""Precomputed odds tables, cached on disk and memory-mapped.
+
+For every die in ``DICE_SIDES`` the file holds "at least t" (survival)
+arrays for one die rolled normally, with advantage and with disadvantage.
+The advantage/disadvantage arrays also give crit-range odds. For ``NdS``
+keep highest ``K`` (N ≤ ``MAX_POOL``) it holds the survival array of the
+kept sum; keep-lowest is the same table mirrored.
+
+File layout (little-endian)::
+
+    magic "DNDT" | u16 version | u16 count | u64 fingerprint
+    count × (32-byte name | u64 offset | u32 length | i32 lo)
+    float64 arrays
+
+The fingerprint covers the format version, the dice and ``MAX_POOL``, so a
+stale cache is rebuilt instead of misread. Lookups index straight into the
+mapped file: O(1), with nothing parsed at start-up.
+"""
+from __future__ import annotations
+import hashlib, mmap, os, struct
+from math import comb
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .engine import DICE_SIDES
+from .history import data_dir
+
+VERSION = 1
+MAX_POOL = 5
+MAGIC = b"DNDT"
+_HEADER = struct.Struct("<4sHHQ")
+_ENTRY = struct.Struct("<32sQIi")
+MODES = ("normal", "advantage", "disadvantage")
+
+
+def fingerprint() -> int:
+    key = f"{VERSION}|{sorted(DICE_SIDES.values())}|{MAX_POOL}".encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "little")
+
+
+def _survival(pmf: List[int], total: int) -> List[float]:
+    out, acc = [0.0] * (len(pmf) + 1), 0
+    for i in range(len(pmf) - 1, -1, -1):
+        acc += pmf[i]
+        out[i] = acc / total
+    return out
+
+
+def _single(sides: int, mode: str) -> List[float]:
+    # index t = target 0..sides+1
+    out = []
+    for t in range(sides + 2):
+        below = min(max(t - 1, 0), sides) / sides
+        p = 1 - below
+        out.append({"normal": p, "advantage": 1 - below * below, "disadvantage": p * p}[mode])
+    return out
+
+
+def _keep_highest(n: int, sides: int, k: int) -> List[int]:
+    """Counts of each kept sum (index = sum - k) over all sides**n outcomes."""
+    # assign dice to faces from high to low; the first k assigned are the kept ones
+    states: Dict[int, List[int]] = {0: [1]}  # dice assigned -> counts by kept sum
+    for v in range(sides, 0, -1):
+        nxt: Dict[int, List[int]] = {}
+        for m, poly in states.items():
+            for j in range(n - m + 1):
+                ways = comb(n - m, j)
+                gain = (min(m + j, k) - min(m, k)) * v
+                tgt = nxt.setdefault(m + j, [])
+                if len(tgt) < len(poly) + gain:
+                    tgt.extend([0] * (len(poly) + gain - len(tgt)))
+                for s, c in enumerate(poly):
+                    if c:
+                        tgt[s + gain] += c * ways
+        states = nxt
+    counts = states[n]
+    return counts[k:] + [0] * (k * sides + 1 - len(counts[k:]))
+
+
+def build() -> Dict[str, Tuple[int, List[float]]]:
+    tables: Dict[str, Tuple[int, List[float]]] = {}
+    for sides in sorted(set(DICE_SIDES.values())):
+        for mode in MODES:
+            tables[f"d{sides}/{mode}"] = (0, _single(sides, mode))
+        for n in range(2, MAX_POOL + 1):
+            for k in range(1, n):
+                tables[f"{n}d{sides}kh{k}"] = (k, _survival(_keep_highest(n, sides, k), sides ** n))
+    return tables
+
+
+def write(path: Path, tables: Dict[str, Tuple[int, List[float]]]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    offset = _HEADER.size + _ENTRY.size * len(tables)
+    directory, blobs = [], []
+    for name, (lo, values) in tables.items():
+        directory.append(_ENTRY.pack(name.encode("ascii"), offset, len(values), lo))
+        blobs.append(struct.pack(f"<{len(values)}d", *values))
+        offset += 8 * len(values)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, VERSION, len(tables), fingerprint()))
+        fh.writelines(directory)
+        fh.writelines(blobs)
+    os.replace(tmp, path)
+
+
+class OddsTables:
+    def __init__(self, path: Path):
+        """Raises ``ValueError`` for a stale, foreign or damaged file."""
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index: Dict[str, Tuple[int, memoryview]] = {}
+        view = memoryview(self._mm)
+        try:
+            self._read_index(view)
+        except (ValueError, struct.error) as e:
+            for _, arr in self._index.values():
+                arr.release()
+            self._index.clear()
+            view.release()
+            self._mm.close()
+            raise ValueError(f"Stale or damaged odds table: {path} ({e})") from None
+
+    def _read_index(self, view: memoryview):
+        size = len(view)
+        magic, version, count, fp = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION or fp != fingerprint():
+            raise ValueError("header mismatch")
+        data_start = _HEADER.size + count * _ENTRY.size
+        if data_start > size:
+            raise ValueError("truncated directory")
+        for i in range(count):
+            name, off, length, lo = _ENTRY.unpack_from(view, _HEADER.size + i * _ENTRY.size)
+            if off < data_start or off + 8 * length > size or not length:
+                raise ValueError("table outside the file")
+            self._index[name.rstrip(b"\0").decode("ascii")] = (lo, view[off:off + 8 * length].cast("d"))
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "OddsTables":
+        """Map the cached tables, building and saving them first if needed."""
+        path = Path(path or data_dir() / f"odds-v{VERSION}.bin")
+        try:
+            return cls(path)
+        except (OSError, ValueError):
+            write(path, build())
+            return cls(path)
+
+    def _at(self, name: str, target: int) -> float:
+        lo, arr = self._index[name]
+        i = target - lo
+        if i <= 0:
+            return 1.0
+        return arr[i] if i < len(arr) else 0.0
+
+    def at_least(self, sides: int, target: int, mode: str = "normal") -> float:
+        """P(one die ≥ target), rolled normally, with advantage or disadvantage."""
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        return self._at(f"d{sides}/{mode}", target)
+
+    def crit_chance(self, crit_range: int = 20, mode: str = "normal", sides: int = 20) -> float:
+        return self.at_least(sides, crit_range, mode)
+
+    def keep_at_least(self, n: int, sides: int, k: int, target: int, highest: bool = True) -> float:
+        """P(sum of the highest/lowest ``k`` of ``n`` dice ≥ target)."""
+        if k == n:
+            raise ValueError("Keeping every die is a plain sum; use probability.distribution().")
+        if highest:
+            return self._at(f"{n}d{sides}kh{k}", target)
+        # lowest k of X is k*(sides+1) minus the highest k of the mirrored dice
+        return 1.0 - self._at(f"{n}d{sides}kh{k}", k * (sides + 1) - target + 1)
+
+    def keep_mean(self, n: int, sides: int, k: int, highest: bool = True) -> float:
+        lo, arr = self._index[f"{n}d{sides}kh{k}"]
+        mean = lo + sum(arr[1:])  # E[S] = sum of P(S >= t) over t >= 1
+        return mean if highest else k * (sides + 1) - mean
+
+    def close(self):
+        self._index.clear()
+        self._mm.close()
@@ -0,0 +1,65 @@
+import pytest
+
+from dndroller import engine
+from dndroller.engine import RollEngine
+from dndroller.rng import SeededBackend
+
+needs_numpy = pytest.mark.skipif(not engine.HAVE_NUMPY, reason="NumPy not installed")
+
+
+def cycling_entropy():
+    """Every byte value in turn, so each word is seen equally often."""
+    pos = 0
+
+    def entropy(n: int) -> bytes:
+        nonlocal pos
+        out = bytes((pos + i) % 256 for i in range(n))
+        pos += n
+        return out
+    return entropy
+
+
+@pytest.mark.parametrize("use_numpy", [False, pytest.param(True, marks=needs_numpy)])
+@pytest.mark.parametrize("sides", [3, 5, 6, 7, 20, 100])
+def test_rejection_sampling_is_unbiased(use_numpy, sides):
+    # 0..255 once: only the words below the largest multiple of ``sides`` survive,
+    # and those cover every face exactly the same number of times
+    eng = RollEngine(cycling_entropy(), use_numpy)
+    limit = 256 - 256 % sides
+    counts = eng.counts(limit, sides)
+    assert counts == [limit // sides] * sides
+
+
+@pytest.mark.parametrize("use_numpy", [False, pytest.param(True, marks=needs_numpy)])
+def test_faces_in_range(use_numpy):
+    eng = RollEngine(SeededBackend(3).randbytes, use_numpy)
+    for sides in (1, 2, 6, 255, 256, 257, 70_000, 1 << 32, (1 << 32) + 1):
+        values = eng.roll(500, sides)
+        assert len(values) == 500 and min(values) >= 1 and max(values) <= sides
+
+
+@needs_numpy
+@pytest.mark.parametrize("sides", [4, 6, 20, 100, 1000, 70_000])
+def test_numpy_and_pure_python_agree(sides):
+    fast = RollEngine(SeededBackend(7).randbytes, use_numpy=True)
+    slow = RollEngine(SeededBackend(7).randbytes, use_numpy=False)
+    assert fast.roll(5_000, sides) == slow.roll(5_000, sides)
+    assert list(fast.roll_array(5_000, sides)) == list(slow.roll_array(5_000, sides))
+    assert fast.counts(20_000, sides) == slow.counts(20_000, sides)
+
+
+def test_seeded_histogram_is_flat():
+    eng = RollEngine(SeededBackend(11).randbytes)
+    n, sides = 60_000, 6
+    counts = eng.counts(n, sides)
+    expected = n / sides
+    chi2 = sum((c - expected) ** 2 / expected for c in counts)
+    assert chi2 < 20.5  # p ≈ 0.001 for 5 degrees of freedom
+
+
+def test_rejects_bad_requests():
+    eng = RollEngine(SeededBackend(1).randbytes)
+    with pytest.raises(ValueError):
+        eng.roll(-1, 6)
+    with pytest.raises(ValueError):
+        eng.roll(1, 0)
@@ -0,0 +1,67 @@
+import pytest
+
+from dndroller import expr
+from dndroller.engine import make_engine
+
+
+@pytest.mark.parametrize("text, terms, constant", [
+    ("1d20", [(1, 1, 20, None, False, 0)], 0),
+    ("4d6kh3 + 2d8! + 1d4 - 2", [(1, 4, 6, ("h", 3), False, 0), (1, 2, 8, None, True, 0),
+                                  (1, 1, 4, None, False, 0)], -2),
+    ("  2D20KL1 ", [(1, 2, 20, ("l", 1), False, 0)], 0),
+    ("-d4 + 3 + 2", [(-1, 1, 4, None, False, 0)], 5),
+    ("4d6dl1", [(1, 4, 6, ("h", 3), False, 0)], 0),
+    ("4d6dh1", [(1, 4, 6, ("l", 3), False, 0)], 0),
+    ("2d6r1", [(1, 2, 6, None, False, 1)], 0),
+    ("d%", [(1, 1, 100, None, False, 0)], 0),
+    ("7", [], 7),
+])
+def test_grammar(text, terms, constant):
+    plan = expr.compile(text)
+    assert [(t.sign, t.qty, t.sides, t.keep, t.explode, t.reroll) for t in plan.terms] == terms
+    assert plan.constant == constant
+
+
+def test_fudge_dice_are_registered_dice():
+    term, = expr.compile("4dF").terms
+    assert term.sides == 3 and term.key == "dF"
+
+
+def test_compile_is_cached_across_spacing_and_case():
+    assert expr.compile("2d6 + 1") is expr.compile(" 2D6  +  1")
+
+
+@pytest.mark.parametrize("text, key", [
+    ("1d0", "expr_sides"),
+    ("1d6r6", "expr_reroll_all"),
+    ("4d6kh3kl1", "expr_one_keep"),
+    ("2d6kh3", "expr_keep_count"),
+    ("2d6 * 2", "expr_unexpected"),
+    ("1d6 +- 2", "expr_two_ops"),
+    ("1d6 2", "expr_missing_op"),
+    ("1d6 +", "expr_incomplete"),
+    ("", "expr_incomplete"),
+    ("1000001d6", "expr_max_dice"),
+])
+def test_errors(text, key):
+    with pytest.raises(expr.ExprError) as info:
+        expr.compile(text)
+    assert info.value.key == key
+    assert isinstance(info.value, ValueError)
+
+
+def test_roll_totals_follow_signs_and_keeps():
+    eng = make_engine("seeded", 1)
+    for _ in range(200):
+        res = expr.roll("4d6kh3 - 1d4 + 2", eng)
+        keep, minus = res.terms
+        assert sorted(keep.kept) == sorted(keep.rolls)[1:]
+        assert res.total == sum(keep.kept) - sum(minus.kept) + 2
+        assert 3 - 4 + 2 <= res.total <= 18 - 1 + 2
+
+
+def test_exploding_dice_add_a_die_per_maximum():
+    eng = make_engine("seeded", 2)
+    for _ in range(200):
+        rolls = expr.roll("3d4!", eng).terms[0].rolls
+        assert len(rolls) == 3 + rolls.count(4)
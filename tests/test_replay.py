@@ -0,0 +1,66 @@
+import pytest
+
+from dndroller import replay
+from dndroller.history import Entry
+from dndroller.replay import SessionRecorder, read_session
+
+ENTRIES = [
+    (Entry("2d6", [(6, [3, 5])], 2, 10, t=1000.0), "2d6", None),
+    (Entry("1d20 - 1d20 - 1d4", [(20, [19, 4]), (4, [2])], 0, 13, t=1001.5),
+     "1d20 - 1d20 - 1d4", [1, -1, -1]),
+    (Entry("4dF", [("dF", [1, 2, 3, 3])], 0, 1, "force", t=1002.0), "Fudge", None),
+    (Entry("1d70000", [(70_000, [65_536])], -3, 65_533, t=1003.0), "d70000", None),
+]
+
+
+def record(path, entries=ENTRIES):
+    rec = SessionRecorder(path)
+    for entry, label, signs in entries:
+        rec.append(entry, label, signs)
+    rec.close()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "s.dnds"
+    record(path)
+    got = list(read_session(path))
+    assert len(got) == len(ENTRIES)
+    for r, (entry, label, signs) in zip(got, ENTRIES):
+        assert (r.t, r.label, r.mode, r.mod, r.total) == (entry.t, label, entry.mode, entry.mod, entry.total)
+        assert r.results == [v for _, v in entry.pairs()]
+        assert r.keys == [k for k, _ in entry.pairs()]
+        assert r.signs == (signs or [1] * len(r.results))
+    assert got[1].dice == [(20, [19]), (20, [4]), (4, [2])]
+    assert got[2].sides == [3] * 4
+
+
+@pytest.mark.parametrize("cut", [1, 5, 20, 40])
+def test_torn_record_ends_the_stream(tmp_path, cut):
+    path = tmp_path / "s.dnds"
+    record(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-cut])
+    got = list(read_session(path))
+    assert len(got) == len(ENTRIES) - 1
+    assert got[-1].label == ENTRIES[-2][1]
+
+
+def test_foreign_file_is_refused(tmp_path):
+    path = tmp_path / "s.dnds"
+    path.write_bytes(b"NOPE\x01\x00")
+    with pytest.raises(ValueError):
+        read_session(path)
+
+
+def test_unrecordable_roll(tmp_path):
+    with pytest.raises(ValueError):
+        replay.pack(Entry("x", [("no such die", [1])]), "x")
+
+
+def test_export_keeps_signs(tmp_path):
+    import io
+    path = tmp_path / "s.dnds"
+    record(path, ENTRIES[1:2])
+    out = io.StringIO()
+    assert replay.export(path, out, "csv") == 1
+    assert out.getvalue().splitlines()[1].endswith("d20:19; -d20:4; -d4:2")
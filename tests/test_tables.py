@@ -0,0 +1,62 @@
+from fractions import Fraction
+from itertools import product
+
+import pytest
+
+from dndroller import tables
+from dndroller.tables import OddsTables
+
+
+@pytest.fixture(scope="module")
+def odds(tmp_path_factory):
+    t = OddsTables.load(tmp_path_factory.mktemp("odds") / "odds.bin")
+    yield t
+    t.close()
+
+
+def exact_keep(n, sides, k, highest=True):
+    """P(kept sum ≥ t) for every t, by enumerating all sides**n rolls."""
+    sums = [sum(sorted(r, reverse=highest)[:k]) for r in product(range(1, sides + 1), repeat=n)]
+    return {t: Fraction(sum(s >= t for s in sums), len(sums)) for t in range(k - 1, k * sides + 2)}
+
+
+@pytest.mark.parametrize("target", range(0, 22))
+def test_d20_modes(odds, target):
+    below = Fraction(min(max(target - 1, 0), 20), 20)
+    assert odds.at_least(20, target) == pytest.approx(float(1 - below))
+    assert odds.at_least(20, target, "advantage") == pytest.approx(float(1 - below ** 2))
+    assert odds.at_least(20, target, "disadvantage") == pytest.approx(float((1 - below) ** 2))
+
+
+def test_crit_chance(odds):
+    assert odds.crit_chance() == pytest.approx(0.05)
+    assert odds.crit_chance(19, "advantage") == pytest.approx(1 - 0.9 ** 2)
+
+
+@pytest.mark.parametrize("n, sides, k", [(2, 20, 1), (3, 6, 2), (4, 6, 3), (3, 8, 1), (4, 4, 2)])
+@pytest.mark.parametrize("highest", [True, False])
+def test_keep_against_enumeration(odds, n, sides, k, highest):
+    for target, p in exact_keep(n, sides, k, highest).items():
+        assert odds.keep_at_least(n, sides, k, target, highest) == pytest.approx(float(p), abs=1e-12)
+
+
+def test_keep_mean(odds):
+    assert odds.keep_mean(4, 6, 3) == pytest.approx(15869 / 1296)
+    assert odds.keep_mean(2, 20, 1, highest=False) == pytest.approx(7.175)
+
+
+def test_keeping_every_die_is_refused(odds):
+    with pytest.raises(ValueError):
+        odds.keep_at_least(3, 6, 3, 10)
+
+
+def test_damaged_file_is_rebuilt(tmp_path):
+    path = tmp_path / "odds.bin"
+    tables.write(path, tables.build())
+    data = bytearray(path.read_bytes())
+    path.write_bytes(data[:len(data) // 2])
+    with pytest.raises(ValueError):
+        OddsTables(path)
+    t = OddsTables.load(path)
+    assert t.at_least(6, 4) == pytest.approx(0.5)
+    t.close()